@@ -7,6 +7,16 @@ import type {
   ApiResponse 
 } from '../types'
 
+// 聊天区最多保留的消息条数，超出后丢弃最早的消息，避免长时间运行时列表无限增长；
+// 消息数超过 MESSAGE_TRIM_WATERMARK 时才一次性裁剪回 MAX_MESSAGES，而不是每追加一条就移除一条
+const MAX_MESSAGES = 1000
+const MESSAGE_TRIM_WATERMARK = 1200
+
+// 系统日志最多保留的行数，超出后丢弃最早的日志，任务面板只需维护固定数量的行
+const MAX_LOG_LINES = 500
+// 单行日志最多显示的字符数，超长的日志（如整段 JSON）截断后再显示
+const MAX_LOG_LINE_LENGTH = 500
+
 /**
  * 聊天逻辑 Composable
  * 处理消息发送、接收、流式输出和任务跟踪
@@ -19,11 +29,25 @@ export function useChat() {
   const tasks = ref<Task[]>([])
   const inputMessage = ref('')
   const currentStreamMessageId = ref<string | null>(null)
+  let currentStreamMessage: Message | null = null
+  let nextLogId = 0
+  // 当前的"系统日志"任务条目（响应式代理），清空任务列表时重置
+  let logTask: Task | null = null
   const currentElicitation = ref<{
     message: string
     schema?: ElicitationSchema
   } | null>(null)
 
+  /**
+   * 追加消息，超过裁剪水位时批量丢弃最早的消息
+   */
+  const pushMessage = (message: Message) => {
+    messages.value.push(message)
+    if (messages.value.length > MESSAGE_TRIM_WATERMARK) {
+      messages.value.splice(0, messages.value.length - MAX_MESSAGES)
+    }
+  }
+
   // ==================== 事件处理 ====================
   
   const handlePyWebViewEvent = (eventDetail: PyWebViewEventDetail) => {
@@ -46,6 +70,9 @@ export function useChat() {
       case 'task_log':
         handleTaskLog(data.description)
         break
+      case 'task_log_batch':
+        data.descriptions.forEach(handleTaskLog)
+        break
       case 'task_update':
         handleTaskUpdate(data)
         break
@@ -60,15 +87,30 @@ export function useChat() {
     }
   }
 
+  // 状态栏、加载状态和进度条只需显示最新值，同一帧内的多次更新合并为一次；
+  // 每次更新时重新插入，使刷新顺序与各项最后一次更新的先后一致
+  const pendingUiUpdates = new Map<string, () => void>()
+  let uiUpdateFrame = 0
+
+  const scheduleUiUpdate = (key: string, apply: () => void) => {
+    pendingUiUpdates.delete(key)
+    pendingUiUpdates.set(key, apply)
+    if (!uiUpdateFrame) {
+      uiUpdateFrame = requestAnimationFrame(() => {
+        uiUpdateFrame = 0
+        pendingUiUpdates.forEach(update => update())
+        pendingUiUpdates.clear()
+      })
+    }
+  }
+
   /**
    * 处理任务更新
    */
   const handleTaskUpdate = (data: any) => {
     if (data.description) {
       // 调用全局状态管理
-      if (window.setStatus) {
-        window.setStatus(data.description)
-      }
+      scheduleUiUpdate('status', () => window.setStatus?.(data.description))
       // 也添加到任务日志
       handleTaskLog(data.description)
     }
@@ -81,9 +123,7 @@ export function useChat() {
     const isLoading = data.loading !== undefined ? data.loading : (data === true || (data && data[0] === true))
     const message = data.message || (typeof data === 'string' ? data : (data && data[1]) || '正在处理...')
     
-    if (window.setLoading) {
-      window.setLoading(isLoading, message)
-    }
+    scheduleUiUpdate('loading', () => window.setLoading?.(isLoading, message))
   }
 
   /**
@@ -92,9 +132,7 @@ export function useChat() {
   const handleProgress = (data: any) => {
     const progress = data.progress !== undefined ? data.progress : (typeof data === 'number' ? data : (data && data[1]) || 0)
     
-    if (window.setProgress) {
-      window.setProgress(progress)
-    }
+    scheduleUiUpdate('progress', () => window.setProgress?.(progress))
   }
 
   /**
@@ -121,7 +159,7 @@ export function useChat() {
                       !(data.schema.description && 
                         data.schema.description.includes('确认模型'))
 
-    messages.value.push({
+    pushMessage({
       id: Date.now().toString(),
       role: 'system',
       content: data.message,
@@ -138,17 +176,27 @@ export function useChat() {
   /**
    * 处理任务日志
    */
-  const handleTaskLog = (description: string) => {
-    // 查找现有的"系统日志"任务条目
-    const existingLogTask = tasks.value.find(
-      task => task.name === '系统日志' && task.status === 'completed'
-    )
+  const handleTaskLog = (rawDescription: string) => {
+    const description = rawDescription.length > MAX_LOG_LINE_LENGTH
+      ? rawDescription.slice(0, MAX_LOG_LINE_LENGTH) + '…'
+      : rawDescription
     
+    // 直接使用缓存的"系统日志"任务条目，不必每条日志都遍历任务列表
+    const existingLogTask = logTask
+    
+    // 日志按行追加到数组中，而不是拼接成一个越来越长的字符串再整体重新渲染
     if (existingLogTask) {
-      const existingDesc = existingLogTask.description || ''
-      existingLogTask.description = existingDesc 
-        ? `${existingDesc}\n${description}` 
-        : description
+      const logs = (existingLogTask.logs ??= [])
+      const last = logs[logs.length - 1]
+      if (last?.text === description) {
+        // 与上一行相同的日志只累加计数，不再新增一行
+        last.count = (last.count ?? 1) + 1
+        return
+      }
+      logs.push({ id: nextLogId++, text: description })
+      if (logs.length > MAX_LOG_LINES) {
+        logs.splice(0, logs.length - MAX_LOG_LINES)
+      }
       existingLogTask.latestLog = description
     } else {
       tasks.value.push({
@@ -156,9 +204,11 @@ export function useChat() {
         name: '系统日志',
         status: 'completed',
         progress: 100,
-        description,
-        latestLog: description
+        latestLog: description,
+        logs: [{ id: nextLogId++, text: description }]
       })
+      // 保存响应式代理的引用，后续日志直接修改它
+      logTask = tasks.value[tasks.value.length - 1]
     }
   }
 
@@ -195,6 +245,7 @@ export function useChat() {
 
     // 用户输入新指令时清空任务列表
     tasks.value = []
+    logTask = null
 
     const userMessage: Message = {
       id: Date.now().toString(),
@@ -202,7 +253,7 @@ export function useChat() {
       content: message,
       timestamp: new Date()
     }
-    messages.value.push(userMessage)
+    pushMessage(userMessage)
     inputMessage.value = ''
     loading.value = true
 
@@ -215,7 +266,7 @@ export function useChat() {
       }
     } catch (error) {
       console.error('发送消息失败:', error)
-      messages.value.push({
+      pushMessage({
         id: Date.now().toString(),
         role: 'assistant',
         content: '抱歉，处理消息时出现错误。',
@@ -236,7 +287,7 @@ export function useChat() {
     if (response.type === 'error') {
       const content = response.response || response.content || response.message || `错误: ${response.error || '未知错误'}`
       if (content.trim()) {
-        messages.value.push({
+        pushMessage({
           id: Date.now().toString(),
           role: 'assistant',
           content,
@@ -247,7 +298,7 @@ export function useChat() {
     } else if (response.type === 'task') {
       const content = response.response || response.content || response.message || ''
       if (content.trim()) {
-        messages.value.push({
+        pushMessage({
           id: Date.now().toString(),
           role: 'assistant',
           content,
@@ -257,7 +308,7 @@ export function useChat() {
         })
       }
     } else if (response.type === 'confirm') {
-      messages.value.push({
+      pushMessage({
         id: Date.now().toString(),
         role: 'system',
         content: response.content || '',
@@ -266,7 +317,7 @@ export function useChat() {
         metadata: response
       })
     } else if (response.type === 'parameter_fix') {
-      messages.value.push({
+      pushMessage({
         id: Date.now().toString(),
         role: 'system',
         content: response.message || '',
@@ -296,29 +347,54 @@ export function useChat() {
     const messageId = `stream_${Date.now()}`
     currentStreamMessageId.value = messageId
     
-    messages.value.push({
+    pushMessage({
       id: messageId,
       role: sender as any,
       content: initialContent,
       timestamp: new Date(),
-      thinking
+      thinking,
+      streaming: true
     })
+    // 保存响应式代理的引用，后续每次更新不必再遍历消息列表查找
+    currentStreamMessage = messages.value[messages.value.length - 1] ?? null
   }
 
-  const updateStreamMessage = (content: string, thinking: string = '') => {
-    if (!currentStreamMessageId.value) return
-    
-    const message = messages.value.find(msg => msg.id === currentStreamMessageId.value)
+  // 尚未写入消息的流式内容：同一帧内收到的多个片段合并成一次更新
+  let pendingStreamContent = ''
+  let pendingStreamThinking = ''
+
+  const flushStreamUpdate = () => {
+    const message = currentStreamMessage
     if (message) {
-      message.content += content
-      if (thinking) {
-        message.thinking = (message.thinking || '') + thinking
+      message.content += pendingStreamContent
+      if (pendingStreamThinking) {
+        message.thinking = (message.thinking || '') + pendingStreamThinking
       }
     }
+    pendingStreamContent = ''
+    pendingStreamThinking = ''
+  }
+
+  const updateStreamMessage = (content: string, thinking: string = '') => {
+    if (!currentStreamMessage) return
+    
+    pendingStreamContent += content
+    if (thinking) {
+      pendingStreamThinking += thinking
+    }
+    scheduleUiUpdate('stream', flushStreamUpdate)
   }
 
   const endStreamMessage = () => {
+    // 结束前立即写入还在等待下一帧的片段
+    if (pendingUiUpdates.delete('stream')) {
+      flushStreamUpdate()
+    }
+    if (currentStreamMessage) {
+      currentStreamMessage.streaming = false
+    }
     currentStreamMessageId.value = null
+    currentStreamMessage = null
   }
 
   /**
@@ -359,7 +435,7 @@ export function useChat() {
       }
     } catch (error) {
       console.error('确认失败:', error)
-      messages.value.push({
+      pushMessage({
         id: Date.now().toString(),
         role: 'assistant',
         content: `❌ 处理操作时出现错误: ${error instanceof Error ? error.message : String(error)}`,
@@ -419,7 +495,7 @@ export function useChat() {
       }
     } catch (error) {
       console.error('Elicitation 响应失败:', error)
-      messages.value.push({
+      pushMessage({
         id: Date.now().toString(),
         role: 'assistant',
         content: `❌ 处理操作时出现错误: ${error instanceof Error ? error.message : String(error)}`,
@@ -32,6 +32,7 @@ export function useLayout() {
   let startWidth = 0
   let startY = 0
   let startRatio = 0
+  let panelHeight = 0
 
   // ==================== 水平调整（右侧面板宽度）====================
   
@@ -78,6 +79,11 @@ export function useLayout() {
    * 开始垂直拖拽调整
    */
   const startVerticalResize = (e: MouseEvent) => {
+    // 拖拽过程中面板高度不变，只在开始时测量一次，避免每次 mousemove 都查询 DOM 并强制布局
+    const rightPanel = document.querySelector('.right-panel') as HTMLElement
+    if (!rightPanel) return
+    panelHeight = rightPanel.getBoundingClientRect().height
+    
     isResizingVertical = true
     startY = e.clientY
     startRatio = taskSectionRatio.value
@@ -91,14 +97,10 @@ export function useLayout() {
    * 处理垂直拖拽
    */
   const handleVerticalResize = (e: MouseEvent) => {
-    if (!isResizingVertical) return
-    
-    const rightPanel = document.querySelector('.right-panel') as HTMLElement
-    if (!rightPanel) return
+    if (!isResizingVertical || !panelHeight) return
     
-    const rect = rightPanel.getBoundingClientRect()
     const deltaY = e.clientY - startY
-    const deltaRatio = (deltaY / rect.height) * 100
+    const deltaRatio = (deltaY / panelHeight) * 100
     
     const newRatio = Math.max(
       CONSTRAINTS.minTaskRatio,
@@ -17,8 +17,9 @@ export function useModel() {
   
   /**
    * 获取可用模型列表
+   * @param refresh - 是否跳过后端预取的缓存，重新查询模型服务
    */
-  const fetchModels = async (): Promise<void> => {
+  const fetchModels = async (refresh = false): Promise<void> => {
     isLoading.value = true
     error.value = ''
     
@@ -27,17 +28,24 @@ export function useModel() {
         throw new Error('pywebview API 未就绪')
       }
       
-      const result: ModelsResponse = await window.pywebview.api.get_models()
+      const result: ModelsResponse = await window.pywebview.api.get_models(refresh)
       
       if (result.error) {
         throw new Error(result.error)
       }
       
       if (result.models) {
-        availableModels.value = result.models.map((model: string) => ({
-          label: model,
-          value: model
-        }))
+        // 模型列表没有变化时保留原数组，下拉框不必重新渲染全部选项
+        const models = result.models
+        const current = availableModels.value
+        const changed = models.length !== current.length ||
+          models.some((model: string, i: number) => current[i]?.value !== model)
+        if (changed) {
+          availableModels.value = models.map((model: string) => ({
+            label: model,
+            value: model
+          }))
+        }
         
         // 设置当前模型
         selectedModel.value = result.current_model || result.models[0] || ''
@@ -96,7 +104,7 @@ export function useModel() {
    * 刷新模型列表
    */
   const refreshModels = async (): Promise<void> => {
-    await fetchModels()
+    await fetchModels(true)
   }
 
   return {
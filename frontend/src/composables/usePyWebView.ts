@@ -31,7 +31,7 @@ export function usePyWebView() {
         isReady.value = true
         return true
       }
-      await delay(RETRY_DELAY)
+      await delayUntilReady(RETRY_DELAY)
     }
     
     lastError.value = 'PyWebView API 未在预期时间内就绪'
@@ -40,10 +40,18 @@ export function usePyWebView() {
   }
 
   /**
-   * 延迟函数
+   * 延迟函数，收到 pywebviewready 事件时立即结束等待
    */
-  const delay = (ms: number): Promise<void> => {
-    return new Promise(resolve => setTimeout(resolve, ms))
+  const delayUntilReady = (ms: number): Promise<void> => {
+    return new Promise(resolve => {
+      const done = () => {
+        clearTimeout(timer)
+        window.removeEventListener('pywebviewready', done)
+        resolve()
+      }
+      const timer = setTimeout(done, ms)
+      window.addEventListener('pywebviewready', done)
+    })
   }
 
   /**
@@ -28,8 +28,8 @@ export function useTheme() {
 
   // 切换主题
   const toggleDarkMode = () => {
+    // 主题类名由下面的 watch 统一应用，这里不再重复设置，避免触发两次样式重算
     isDarkMode.value = !isDarkMode.value
-    applyTheme(isDarkMode.value)
     localStorage.setItem('theme', isDarkMode.value ? 'dark' : 'light')
   }
 
@@ -22,6 +22,9 @@ export function useWindow() {
   let resizeStartWidth = 0
   let resizeStartHeight = 0
   let currentResizeDirection: ResizeDirection | '' = ''
+  let resizeLastX = 0
+  let resizeLastY = 0
+  let resizeFrame = 0
 
   // ==================== 窗口控制方法 ====================
   
@@ -173,10 +176,23 @@ export function useWindow() {
 
   /**
    * 处理调整大小移动
+   * 鼠标移动事件按硬件频率触发，这里只记录最新位置，每帧最多调用一次后端
    */
   const handleResizeMove = (e: MouseEvent) => {
-    const deltaX = e.screenX - resizeStartX
-    const deltaY = e.screenY - resizeStartY
+    resizeLastX = e.screenX
+    resizeLastY = e.screenY
+    if (!resizeFrame) {
+      resizeFrame = requestAnimationFrame(applyResize)
+    }
+  }
+
+  /**
+   * 按最新的鼠标位置调整窗口大小
+   */
+  const applyResize = () => {
+    resizeFrame = 0
+    const deltaX = resizeLastX - resizeStartX
+    const deltaY = resizeLastY - resizeStartY
     
     const { newWidth, newHeight, fixPoint } = calculateNewSize(
       currentResizeDirection as ResizeDirection,
@@ -257,6 +273,11 @@ export function useWindow() {
   const handleResizeEnd = () => {
     window.removeEventListener('mousemove', handleResizeMove)
     window.removeEventListener('mouseup', handleResizeEnd)
+    if (resizeFrame) {
+      // 还有未处理的移动时立即应用，保证窗口停在松开鼠标的位置
+      cancelAnimationFrame(resizeFrame)
+      applyResize()
+    }
     currentResizeDirection = ''
   }
 
@@ -3,7 +3,7 @@ declare global {
     pywebview?: {
       api: {
         send_message: (message: string) => Promise<any>
-        get_models: () => Promise<any>
+        get_models: (refresh?: boolean) => Promise<any>
         get_history: (limit: number) => Promise<any>
         confirm_elicitation: (message: string, content: any, confirmed: boolean) => Promise<any>
         fix_parameters: (action: string, params?: any) => Promise<any>
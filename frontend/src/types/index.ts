@@ -17,12 +17,19 @@ export interface Message {
   metadata?: any
   thinking?: string
   isProcessed?: boolean
+  streaming?: boolean
 }
 
 // ==================== 任务相关类型 ====================
 
 export type TaskStatus = 'pending' | 'running' | 'completed' | 'failed'
 
+export interface TaskLogLine {
+  id: number
+  text: string
+  count?: number
+}
+
 export interface Task {
   id: string
   name: string
@@ -30,6 +37,7 @@ export interface Task {
   progress: number
   description?: string
   latestLog?: string
+  logs?: TaskLogLine[]
 }
 
 // ==================== 参数校验相关类型 ====================
@@ -94,6 +102,7 @@ export type PyWebViewEventType =
   | 'stream_end' 
   | 'elicitation_request'
   | 'task_log'
+  | 'task_log_batch'
   | 'task_update'
   | 'loading'
   | 'progress'
@@ -44,7 +44,8 @@ export function handleError(
   }
 
   if (opts.showMessage) {
-    ElMessage.error(errorMessage)
+    // grouping：相同内容的提示合并到已显示的那一条上并显示次数，连续出现同样的错误时不会每次都创建新的消息组件
+    ElMessage.error({ message: errorMessage, grouping: true })
   }
 
   if (opts.showNotification) {
@@ -70,7 +71,7 @@ export function handleSuccess(
   }
 
   if (opts.showMessage) {
-    ElMessage.success(message)
+    ElMessage.success({ message, grouping: true })
   }
 
   if (opts.showNotification) {
@@ -94,7 +95,7 @@ export function handleWarning(
   }
 
   if (opts.showMessage) {
-    ElMessage.warning(message)
+    ElMessage.warning({ message, grouping: true })
   }
 
   if (opts.showNotification) {
@@ -118,7 +119,7 @@ export function handleInfo(
   }
 
   if (opts.showMessage) {
-    ElMessage.info(message)
+    ElMessage.info({ message, grouping: true })
   }
 
   if (opts.showNotification) {
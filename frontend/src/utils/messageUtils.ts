@@ -43,3 +43,68 @@ export const initFormData = (schema: any): Record<string, any> => {
   })
   return formData
 }
+
+// 构造 Intl.DateTimeFormat 需要加载区域数据，开销较大，所有消息共用同一个实例
+const timeFormat = new Intl.DateTimeFormat('zh-CN', {
+  hour: '2-digit',
+  minute: '2-digit'
+})
+
+/**
+ * 格式化消息时间
+ */
+export const formatTime = (date: Date) => {
+  return timeFormat.format(date)
+}
+
+const HTML_ESCAPES: Record<string, string> = {
+  '&': '&amp;',
+  '<': '&lt;',
+  '>': '&gt;',
+  '"': '&quot;'
+}
+
+/**
+ * 转义 HTML 特殊字符
+ * 消息原文中的标签不会被浏览器当作（可能大量嵌套的）标记解析，也不会插入脚本
+ */
+export const escapeHtml = (text: string) => {
+  return text.replace(/[&<>"]/g, ch => HTML_ESCAPES[ch])
+}
+
+// 需要渲染为 HTML 的内容特征：代码（反引号）或链接（可能是图片）
+const RICH_CONTENT_RE = /`|https?:\/\//
+
+/**
+ * 检查消息内容是否需要渲染为 HTML
+ * 不含代码和链接的内容直接作为纯文本显示，不必生成 HTML 再交给浏览器解析
+ */
+export const hasRichContent = (content: string) => {
+  return RICH_CONTENT_RE.test(content)
+}
+
+// 渲染结果按内容缓存（LRU）：消息组件重新渲染时，内容未变的消息不必重复执行正则替换
+const RENDER_CACHE_SIZE = 200
+const renderCache = new Map<string, string>()
+
+/**
+ * 将消息内容渲染为 HTML
+ */
+export const renderContent = (content: string) => {
+  if (!content) return ''
+  let html = renderCache.get(content)
+  if (html !== undefined) {
+    renderCache.delete(content)
+  } else {
+    html = escapeHtml(content)
+      .replace(/```(\w+)?\n([\s\S]*?)```/g, '<pre><code>$2</code></pre>')
+      .replace(/`([^`]+)`/g, '<code>$1</code>')
+      .replace(/(https?:\/\/[^\s]+?\.(jpg|jpeg|png|gif|webp|svg))/gi, '<img src="$1" alt="" onerror="this.onerror=null;this.src=\'/src/assets/pictures/picture_load_fail.png\'">')
+      .replace(/\n/g, '<br>')
+    if (renderCache.size >= RENDER_CACHE_SIZE) {
+      renderCache.delete(renderCache.keys().next().value!)
+    }
+  }
+  renderCache.set(content, html)
+  return html
+}
@@ -6,10 +6,11 @@
 import sys
 import os
 import threading
-import time
+import json
 import asyncio
 import queue
 import logging
+from collections import deque
 from typing import Dict, Any, Optional, Callable
 import ctypes
 from ctypes import wintypes
@@ -27,26 +28,59 @@ class WebViewLogHandler(logging.Handler):
     """
     WebView日志处理器
     将日志消息发送到Vue前端
+    
+    日志先放入有界队列，按 FLUSH_INTERVAL 合并成一个 task_log_batch 事件发送，
+    避免日志密集时每条日志都调用一次 evaluate_js
     """
     
+    FLUSH_INTERVAL = 1 / 30
+    MAX_PENDING = 500
+    
     def __init__(self, emit_func):
         super().__init__()
         self.emit_func = emit_func
         self.setLevel(logging.INFO)
         self.setFormatter(logging.Formatter('%(message)s'))
+        self._pending = deque(maxlen=self.MAX_PENDING)
+        self._pending_lock = threading.Lock()
+        self._flush_timer = None
     
     def emit(self, record):
         """
-        发送日志记录到前端
+        缓存日志记录，等待批量发送到前端
+        
+        级别过滤已由 setLevel(logging.INFO) 在调用 emit 之前完成
         """
-        if record.levelno >= logging.INFO:
-            log_message = self.format(record)
+        log_message = self.format(record)
+        with self._pending_lock:
+            self._pending.append(log_message)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.FLUSH_INTERVAL, self._flush_pending)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def _flush_pending(self):
+        """将缓存的日志一次性发送到前端"""
+        with self._pending_lock:
+            descriptions = list(self._pending)
+            self._pending.clear()
+            self._flush_timer = None
+        if descriptions:
             # 通过emit_func发送到前端
-            self.emit_func("task_log", {
-                "description": log_message,
+            self.emit_func("task_log_batch", {
+                "descriptions": descriptions,
                 "status": "日志",
                 "progress": None
             })
+    
+    def close(self):
+        """关闭处理器前发送剩余的日志"""
+        with self._pending_lock:
+            timer = self._flush_timer
+        if timer is not None:
+            timer.cancel()
+        self._flush_pending()
+        super().close()
 
 
 # 配置全局日志处理器
@@ -101,7 +135,8 @@ class MCPWorker:
         self.buffer_threshold = 5
         self.elicitation_future = None
         self.interrupted = False
-        self.last_status_time = time.time()
+        self.last_status = None
+        self.models_cache = None
         
     def start(self):
         """启动工作线程"""
@@ -134,17 +169,19 @@ class MCPWorker:
         
         self.initialized = True
         
+        # 连接成功后在工作线程中预取模型列表，前端请求时无需再等待网络请求
+        self.models_cache = self._get_models()
+        
         while self.running:
             try:
-                # 非阻塞方式检查消息队列
-                try:
-                    msg_type, data = self.message_queue.get(timeout=0.1)
-                except queue.Empty:
-                    # 定期打印工作线程状态
-                    if time.time() - self.last_status_time > 5:
-                        print(f"🔄 工作线程运行中，消息队列大小: {self.message_queue.qsize()}")
-                        self.last_status_time = time.time()
-                    continue
+                # stop 也通过消息队列发送，空闲时阻塞等待消息，不再定时唤醒轮询状态
+                msg_type, data = self.message_queue.get()
+                
+                # 只在收到消息且积压的消息数变化时打印工作线程状态
+                status = self.message_queue.qsize()
+                if status != self.last_status:
+                    print(f"🔄 工作线程运行中，消息队列大小: {status}")
+                    self.last_status = status
                     
                 if msg_type == "stop":
                     break
@@ -155,6 +192,7 @@ class MCPWorker:
                     self.result_queue.put(("send_message", result))
                 elif msg_type == "get_models":
                     result = self._get_models()
+                    self.models_cache = result
                     self.result_queue.put(("get_models", result))
                 elif msg_type == "get_history":
                     result = self._get_history(data)
@@ -183,6 +221,9 @@ class MCPWorker:
         
     async def _process_user_input(self, user_input: str) -> Dict[str, Any]:
         """处理用户输入（流式）"""
+        # 新消息开始时清除上一轮状态事件的去重记录
+        reset_ui_event_state()
+        
         # 重置流式状态
         self.stream_started = False
         self.current_response = ""
@@ -190,6 +231,10 @@ class MCPWorker:
         self.buffer = ""
         self.buffer_size = 0
         
+        # 流式回调按 chunk 高频调用，事件发送方法和阈值提前绑定为局部变量
+        emit = self._emit_event
+        buffer_threshold = self.buffer_threshold
+        
         def stream_callback(chunk):
             """流式输出回调"""
             # 使用闭包访问self
@@ -210,7 +255,7 @@ class MCPWorker:
                 self.buffer_size = 0
                 
                 # 发送流式开始事件
-                self._emit_event("stream_start", {
+                emit("stream_start", {
                     "sender": "assistant",
                     "initial_message": chunk_response,
                     "thinking": chunk_thinking
@@ -219,19 +264,13 @@ class MCPWorker:
             elif self.stream_started:
                 # 如果有思考过程，立即发送
                 if chunk_thinking:
-                    # 先发送缓冲区中的内容
-                    if self.buffer:
-                        self._emit_event("stream_update", {
-                            "message": self.buffer,
-                            "thinking": ""
-                        })
-                        self.buffer = ""
-                        self.buffer_size = 0
-                    # 发送思考过程
-                    self._emit_event("stream_update", {
-                        "message": "",
+                    # 缓冲区中的内容和思考过程合并为一次更新发送，前端只需处理一个事件
+                    emit("stream_update", {
+                        "message": self.buffer,
                         "thinking": chunk_thinking
                     })
+                    self.buffer = ""
+                    self.buffer_size = 0
                 
                 # 如果有响应内容，添加到缓冲区
                 if chunk_response:
@@ -239,8 +278,8 @@ class MCPWorker:
                     self.buffer_size += len(chunk_response)
                     
                     # 如果缓冲区达到阈值，发送更新
-                    if self.buffer_size >= self.buffer_threshold:
-                        self._emit_event("stream_update", {
+                    if self.buffer_size >= buffer_threshold:
+                        emit("stream_update", {
                             "message": self.buffer,
                             "thinking": ""
                         })
@@ -316,20 +355,33 @@ class MCPWorker:
         })
         
         # 创建future等待用户响应
-        self.elicitation_future = self.loop.create_future()
+        self.elicitation_future = future = self.loop.create_future()
+        
+        # 超时后直接以 decline 完成 future，不必再用 wait_for 包装一层任务
+        timeout_handle = self.loop.call_later(60.0, self._expire_elicitation, future)
         
         # 等待用户响应 - 注意：这个等待会阻塞工作线程
         # 但确认请求也是通过消息队列发送到工作线程的
         # 所以我们需要在主线程中处理确认请求
         try:
-            result = await asyncio.wait_for(self.elicitation_future, timeout=60.0)
-            return result
-        except asyncio.TimeoutError:
-            return {"action": "decline"}
+            return await future
         except Exception as e:
             import traceback
             traceback.print_exc()
             return {"action": "decline"}
+        finally:
+            timeout_handle.cancel()
+    
+    @staticmethod
+    def _resolve_elicitation(future: asyncio.Future, result: Dict[str, Any]):
+        """在工作线程的事件循环中设置elicitation结果"""
+        if not future.done():
+            future.set_result(result)
+    
+    @classmethod
+    def _expire_elicitation(cls, future: asyncio.Future):
+        """elicitation等待超时，视为用户拒绝"""
+        cls._resolve_elicitation(future, {"action": "decline"})
     
     def _interrupt(self):
         """中断执行"""
@@ -353,8 +405,19 @@ class MCPWorker:
         except Exception as e:
             return {"error": f"操作失败: {str(e)}"}
         
-    def get_models(self) -> Dict[str, Any]:
-        """获取模型列表"""
+    def get_models(self, refresh: bool = False) -> Dict[str, Any]:
+        """获取模型列表
+        
+        Args:
+            refresh: 为 True 时忽略预取的缓存，重新向模型服务查询（用于手动刷新）
+        """
+        cached = self.models_cache
+        if not refresh and cached and cached.get("models"):
+            # 模型列表已预取，只需刷新当前模型
+            return {
+                "models": cached["models"],
+                "current_model": self.client.llm_client.get_current_model()
+            }
         try:
             self.message_queue.put(("get_models", None))
             msg_type, result = self.result_queue.get(timeout=10)
@@ -384,8 +447,10 @@ class MCPWorker:
                 "confirmed": confirmed
             }
             # 直接在主线程中处理确认请求，避免死锁
-            if self.elicitation_future and not self.elicitation_future.done():
-                self.elicitation_future.set_result({
+            future = self.elicitation_future
+            if future and not future.done():
+                # future 属于工作线程的事件循环，通过 call_soon_threadsafe 在该循环中设置结果并唤醒等待者
+                self.loop.call_soon_threadsafe(self._resolve_elicitation, future, {
                     "action": "accept" if data["confirmed"] else "decline",
                     "content": data["content"]
                 })
@@ -430,25 +495,88 @@ _window = None
 _window_normal_state = None  # 记录窗口正常状态的位置和大小
 
 
+# 派发前端事件的JS代码模板，只需填入序列化后的事件数据
+_EVENT_JS_TEMPLATE = (
+    "if (window.dispatchEvent) {"
+    "window.dispatchEvent(new CustomEvent('pywebview_event', {detail: %s}));"
+    "}"
+)
+
+
+# 待执行的事件脚本队列，由单独的派发线程交给 webview 执行，
+# 发出事件的线程（MCP工作线程、日志定时器等）不会阻塞在 run_js 上
+_ui_event_queue: "queue.Queue[str]" = queue.Queue()
+_ui_dispatch_thread: Optional[threading.Thread] = None
+_ui_dispatch_lock = threading.Lock()
+# 派发线程每次最多合并执行的事件脚本数
+_UI_DISPATCH_BATCH = 100
+
+
+def _dispatch_ui_events():
+    """派发线程：取出排队的事件脚本，合并后一次交给 webview 执行"""
+    while True:
+        scripts = [_ui_event_queue.get()]
+        while len(scripts) < _UI_DISPATCH_BATCH:
+            try:
+                scripts.append(_ui_event_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        window = _window
+        if window is None:
+            continue
+        try:
+            # run_js（pywebview 5.0+）直接执行脚本，不像 evaluate_js 那样等待并回传结果
+            run_js = getattr(window, 'run_js', None) or window.evaluate_js
+            run_js(";".join(scripts))
+        except Exception:
+            pass
+
+
+def _ensure_ui_dispatcher():
+    """首次发送事件时启动派发线程"""
+    global _ui_dispatch_thread
+    if _ui_dispatch_thread is not None:
+        return
+    with _ui_dispatch_lock:
+        if _ui_dispatch_thread is None:
+            thread = threading.Thread(target=_dispatch_ui_events, name="ui-event-dispatcher", daemon=True)
+            thread.start()
+            _ui_dispatch_thread = thread
+
+
+# 表示状态的事件类型：与上一次发送到前端的内容相同的事件不会改变界面，不再重复发送
+_STATE_EVENT_TYPES = frozenset({'progress', 'loading'})
+_last_state_events: Dict[str, str] = {}
+
+
+def reset_ui_event_state():
+    """清除状态类事件的去重记录（新消息或新任务开始时调用）"""
+    _last_state_events.clear()
+
+
 def emit_ui_event(event_type: str, data: Dict[str, Any]):
     """发送UI事件到前端"""
     global _window
-    # 通过JavaScript发送事件到前端
-    if _window:
-        try:
-            import json
-            event_data = json.dumps({'type': event_type, 'data': data})
-            js_code = f"""
-            if (window.dispatchEvent) {{
-                const event = new CustomEvent('pywebview_event', {{detail: {event_data}}});
-                window.dispatchEvent(event);
-            }}
-            """
-            _window.evaluate_js(js_code)
-        except Exception as e:
-            pass
-    
-    # 同时也调用回调函数（保持兼容性）
+    try:
+        event_data = json.dumps({'type': event_type, 'data': data})
+    except (TypeError, ValueError):
+        event_data = None
+    
+    # 通过JavaScript发送事件到前端（排队后由派发线程执行）
+    if _window and event_data is not None:
+        is_state_event = event_type in _STATE_EVENT_TYPES
+        # 序列化后的字符串作为去重键，一次字符串比较代替逐字段比较
+        if not (is_state_event and _last_state_events.get(event_type) == event_data):
+            _ensure_ui_dispatcher()
+            _ui_event_queue.put(_EVENT_JS_TEMPLATE % event_data)
+            if is_state_event:
+                _last_state_events[event_type] = event_data
+        if event_type == 'loading' and not data.get('loading'):
+            # 任务结束：下一个任务的状态事件都要重新发送
+            reset_ui_event_state()
+    
+    # 同时也调用回调函数（保持兼容性，不做去重）
     for callback in _ui_callbacks:
         try:
             callback(event_type, data)
@@ -479,11 +607,11 @@ class PyWebViewAPI:
             return {"error": "MCP Client 未初始化"}
         return self.mcp_worker.send_message(message)
     
-    def get_models(self):
+    def get_models(self, refresh=False):
         """获取模型列表"""
         if self.mcp_worker is None:
             return {"error": "MCP Client 未初始化"}
-        return self.mcp_worker.get_models()
+        return self.mcp_worker.get_models(refresh)
     
     def get_history(self, limit=50):
         """获取聊天历史"""
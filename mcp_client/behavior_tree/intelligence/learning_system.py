@@ -3,11 +3,16 @@
 
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from collections import deque
+from typing import Dict, Any, Deque, Optional
 from datetime import datetime
 from pathlib import Path
 
 
+# 修正记录最多保留的条数，超出后从最早的记录开始丢弃
+MAX_CORRECTION_HISTORY = 500
+
+
 class InferenceLearningSystem:
     """推断学习系统
     
@@ -23,8 +28,10 @@ class InferenceLearningSystem:
         self.logger = logging.getLogger(__name__)
         
         # 内存中的学习数据
-        self.correction_history: List[Dict[str, Any]] = []
+        self.correction_history: Deque[Dict[str, Any]] = deque(maxlen=MAX_CORRECTION_HISTORY)
         self.user_patterns: Dict[str, Any] = {}
+        # 上次保存后新增的修正条数（历史记录达到上限后长度不再变化，不能再按长度判断）
+        self._unsaved_count = 0
         
         # 加载已有数据
         self._load_model()
@@ -35,7 +42,7 @@ class InferenceLearningSystem:
             try:
                 with open(self.model_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                    self.correction_history = data.get('corrections', [])
+                    self.correction_history.extend(data.get('corrections', []))
                     self.user_patterns = data.get('patterns', {})
                 self.logger.info(f"加载学习模型: {len(self.correction_history)} 条记录")
             except Exception as e:
@@ -47,10 +54,11 @@ class InferenceLearningSystem:
             self.model_path.parent.mkdir(parents=True, exist_ok=True)
             with open(self.model_path, 'w', encoding='utf-8') as f:
                 json.dump({
-                    'corrections': self.correction_history,
+                    'corrections': list(self.correction_history),
                     'patterns': self.user_patterns,
                     'last_updated': datetime.now().isoformat()
                 }, f, ensure_ascii=False, indent=2)
+            self._unsaved_count = 0
         except Exception as e:
             self.logger.error(f"保存学习模型失败: {e}")
     
@@ -73,13 +81,14 @@ class InferenceLearningSystem:
         }
         
         self.correction_history.append(record)
+        self._unsaved_count += 1
         
         # 更新模式
         if inferred_value != user_value:
             self._update_pattern(record)
         
         # 定期保存
-        if len(self.correction_history) % 10 == 0:
+        if self._unsaved_count >= 10:
             self._save_model()
     
     def _update_pattern(self, record: Dict[str, Any]):
@@ -8,6 +8,18 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import json
 
+# DOT 颜色名到网页配色的映射，模块加载时构建一次，不必每个节点都重新创建
+_FILL_COLOR_MAP = {
+    "orange": "#f97316",
+    "gold": "#fbbf24",
+    "gray": "#6b7280",
+    "green": "#22c55e",
+    "red": "#ef4444",
+    "blue": "#3b82f6",
+    "purple": "#a855f7",
+    "pink": "#ec4899"
+}
+
 @dataclass
 class DOTNode:
     """DOT节点"""
@@ -269,17 +281,7 @@ class DOTHTMLRenderer:
         
         # 应用填充颜色
         if node.fillcolor and node.fillcolor != "white":
-            color_map = {
-                "orange": "#f97316",
-                "gold": "#fbbf24",
-                "gray": "#6b7280",
-                "green": "#22c55e",
-                "red": "#ef4444",
-                "blue": "#3b82f6",
-                "purple": "#a855f7",
-                "pink": "#ec4899"
-            }
-            bg_color = color_map.get(node.fillcolor.lower(), node.fillcolor)
+            bg_color = _FILL_COLOR_MAP.get(node.fillcolor.lower(), node.fillcolor)
             styles.append(f"background: {bg_color}")
         
         # 应用字体颜色
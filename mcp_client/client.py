@@ -377,11 +377,15 @@ class MCPClient:
                     # 获取第一个内容项
                     first_item = content[0]
                     if hasattr(first_item, 'text'):
-                        # 尝试解析JSON格式的返回值
+                        # 尝试解析JSON格式的返回值：只有以 { 开头的文本才可能是字典，
+                        # 普通文本不必进入 json.loads 再抛出异常
                         text = first_item.text
-                        try:
-                            import json
-                            parsed = json.loads(text)
+                        if text.lstrip().startswith("{"):
+                            try:
+                                parsed = json.loads(text)
+                            except json.JSONDecodeError:
+                                # 如果不是JSON，直接返回文本
+                                parsed = None
                             if isinstance(parsed, dict):
                                 # 如果是字典，直接返回
                                 self.logger.debug(f"[send_tool_call] 返回 JSON 结果")
@@ -389,9 +393,6 @@ class MCPClient:
                                     "type": "tool_response",
                                     "result": parsed
                                 }
-                        except (json.JSONDecodeError, ValueError):
-                            # 如果不是JSON，直接返回文本
-                            pass
                         self.logger.debug(f"[send_tool_call] 返回文本结果")
                         return {
                             "type": "tool_response",
@@ -427,6 +428,8 @@ class MCPClient:
             包含summary和plan的字典
         """
         result_text = result.get("result", "")
+        # 前缀只拼接一次，各分支直接在前面加上即可
+        head = f"{prefix}: " if prefix else ""
         
         # 处理有formatted_message的结果（如天气查询）
         if isinstance(result, dict):
@@ -436,13 +439,11 @@ class MCPClient:
                 if isinstance(tool_result, dict):
                     formatted_message = tool_result.get("formatted_message")
                     if formatted_message:
-                        summary = f"{prefix}: {formatted_message}" if prefix else formatted_message
-                        return {"summary": summary, "plan": plan if plan else {}}
+                        return {"summary": head + formatted_message, "plan": plan if plan else {}}
             # 也检查直接在result中的formatted_message
             formatted_message = result.get("formatted_message")
             if formatted_message:
-                summary = f"{prefix}: {formatted_message}" if prefix else formatted_message
-                return {"summary": summary, "plan": plan if plan else {}}
+                return {"summary": head + formatted_message, "plan": plan if plan else {}}
         
         # 处理file_operations等工具的返回格式：{"success": True, "result": "...", "path": "..."}
         if isinstance(result_text, dict):
@@ -455,11 +456,8 @@ class MCPClient:
             is_folder_exists = "文件夹已存在" in tool_result or "文件夹已存在" in error
             
             if success or is_folder_exists:
-                if is_folder_exists:
-                    # 文件夹已存在视为成功
-                    summary = f"{prefix}: 文件夹已存在" if prefix else "文件夹已存在"
-                else:
-                    summary = f"{prefix}: {tool_result}" if prefix else tool_result
+                # 文件夹已存在视为成功
+                summary = head + ("文件夹已存在" if is_folder_exists else tool_result)
                 if path:
                     summary += f" (路径: {path})"
                 return {"summary": summary, "plan": plan if plan else {}}
@@ -468,8 +466,7 @@ class MCPClient:
                 return {"summary": summary, "plan": plan if plan else {}}
         
         else:
-            summary = f"{prefix}: {str(result)}" if prefix else str(result)
-            return {"summary": summary, "plan": plan if plan else {}}
+            return {"summary": head + str(result), "plan": plan if plan else {}}
     
     async def process_user_intent(self, query: str, stream_callback: Optional[Callable] = None) -> Dict[str, Any]:
         """处理用户意图（UI调用接口）
@@ -831,18 +828,16 @@ class MCPClient:
             error = execution_result.get("error", "未知错误")
             return f"❌ 任务执行失败: {error}"
         
-        # 获取所有非entities的节点结果，按节点ID排序
-        node_results = []
-        for key, value in blackboard.items():
-            if key != "entities" and isinstance(value, dict):
-                node_results.append((key, value))
+        # 只取最后一个节点的结果：从末尾向前找到第一个非entities的节点即可，不必收集全部节点
+        last_value = next(
+            (value for key, value in reversed(blackboard.items())
+             if key != "entities" and isinstance(value, dict)),
+            None
+        )
         
-        if not node_results:
+        if last_value is None:
             return "✅ 任务执行完成"
         
-        # 只取最后一个节点的结果
-        last_node_id, last_value = node_results[-1]
-        
         # 提取 formatted_message
         if "formatted_message" in last_value:
             return last_value["formatted_message"]
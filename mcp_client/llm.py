@@ -5,12 +5,16 @@ import logging
 import json
 import asyncio
 import os
+import re
 from typing import Dict, Any, Optional, Callable
 from user_config.config import load_config, get_config
 from mcp_client.behavior_tree.prompt.config_prompts import BEHAVIOR_TREE_CONFIG_PRINCIPLES
 from mcp_client.prompt.intent_prompts import INTENT_PARSE_PROMPT
 from .behavior_tree import BehaviorTree
 
+# 连接类错误的特征（拒绝连接、连接重置等），一次扫描完成判断
+_CONNECTION_ERROR_RE = re.compile(r"10061|10054|拒绝|refused|connection", re.IGNORECASE)
+
 class LLMClient:
     def __init__(self):
         self.config = load_config()
@@ -35,6 +39,10 @@ class LLMClient:
         # 移除BehaviorTree实例，直接使用静态方法
         pass
         
+        # 最近一次格式化的工具列表及其文本，工具列表不变时直接复用
+        self._last_tools = ()
+        self._last_tools_text = ""
+        
         # Ollama默认连接到http://localhost:11434
         # 注意：如果需要自定义Ollama服务地址，请设置环境变量 OLLAMA_HOST
         # 例如：set OLLAMA_HOST=http://localhost:11434
@@ -121,13 +129,13 @@ class LLMClient:
             # 使用asyncio.run_in_executor在后台线程中运行同步的ollama.generate
             loop = asyncio.get_event_loop()
             
-            # 存储完整响应
-            full_response = ""
-            full_thinking = ""
+            # 存储完整响应：片段先放进列表，结束后一次拼接，避免逐块 += 反复复制整段文本
+            response_parts = []
+            thinking_parts = []
             stream_error = None
             
             def stream_handler():
-                nonlocal full_response, full_thinking, stream_error
+                nonlocal stream_error
                 try:
                     # 使用ollama的流式生成
                     # 添加keep_alive参数，避免上下文缓存
@@ -156,9 +164,10 @@ class LLMClient:
                                 chunk_thinking = ""
 
                             # 累加到完整响应
-                            full_response += chunk_response
+                            if chunk_response:
+                                response_parts.append(chunk_response)
                             if chunk_thinking:
-                                full_thinking += chunk_thinking
+                                thinking_parts.append(chunk_thinking)
                             
                             # 调用回调函数（同步调用）
                             if stream_callback:
@@ -183,8 +192,8 @@ class LLMClient:
                             self.logger.warning(f"模型 {self.model} 不支持思考功能，将禁用思考模式重新尝试")
                             # 重新尝试不使用思考模式
                             chunk_count = 0
-                            full_response = ""
-                            full_thinking = ""
+                            response_parts.clear()
+                            thinking_parts.clear()
                             for chunk in ollama.generate(
                                 model=self.model,
                                 prompt=prompt,
@@ -206,9 +215,10 @@ class LLMClient:
                                     chunk_thinking = ""
                                 
                                 # 累加到完整响应
-                                full_response += chunk_response
+                                if chunk_response:
+                                    response_parts.append(chunk_response)
                                 if chunk_thinking:
-                                    full_thinking += chunk_thinking
+                                    thinking_parts.append(chunk_thinking)
                                 
                                 # 调用回调函数（同步调用）
                                 if stream_callback:
@@ -255,8 +265,10 @@ class LLMClient:
             elapsed_time = time.time() - start_time
             self.logger.info(f"LLM生成完成，耗时: {elapsed_time:.2f}秒")
             
+            full_response = "".join(response_parts)
+            
             # 检查响应中是否包含思考过程
-            thinking = full_thinking
+            thinking = "".join(thinking_parts)
             if not thinking:
                 # 尝试其他可能的字段名
                 thinking = ""
@@ -271,8 +283,7 @@ class LLMClient:
             traceback.print_exc()
             
             # 检查是否是连接错误
-            error_str = str(e)
-            if "10061" in error_str or "10054" in error_str or "拒绝" in error_str or "refused" in error_str.lower() or "connection" in error_str.lower():
+            if _CONNECTION_ERROR_RE.search(str(e)):
                 raise ConnectionError(f"无法与LLM服务通信，请确保Ollama已启动并正常运行") from e
             
             return {
@@ -496,6 +507,13 @@ class LLMClient:
         if not tools:
             return "没有可用的工具"
         
+        # 工具列表在连接后通常不变，与上次是同一批工具对象时直接返回缓存的文本
+        tools = tuple(tools)
+        if len(tools) == len(self._last_tools) and all(
+            a is b for a, b in zip(tools, self._last_tools)
+        ):
+            return self._last_tools_text
+        
         tool_descriptions = ["可用工具列表：\n"]
         
         for tool in tools:
@@ -530,4 +548,6 @@ class LLMClient:
                             tool_descriptions.append(f"     {param_desc}")
                     tool_descriptions.append("")
         
-        return "\n".join(tool_descriptions)
+        self._last_tools = tools
+        self._last_tools_text = "\n".join(tool_descriptions)
+        return self._last_tools_text
@@ -8,6 +8,33 @@ import sys
 sys.path.append('..')
 from user_config.config import load_config
 
+# 文件写入模式
+WRITE_MODES = ["'w'", '"w"', "'a'", '"a"', "'x'", '"x"']
+
+# 文件删除操作
+DANGEROUS_DELETE_PATTERNS = [
+    "os.remove",
+    "os.unlink",
+    "os.rmdir",
+    "os.removedirs",
+    "shutil.rmtree",
+    ".unlink",
+    ".remove",
+    ".rmdir",
+    ".removedirs"
+]
+
+# 目录操作
+DANGEROUS_DIR_KEYWORDS = ["os.mkdir", "os.makedirs", "os.listdir", "os.walk"]
+
+# 其他危险操作
+DANGEROUS_KEYWORDS = [
+    "os.system", "subprocess", "eval(", "exec(", "__import__",
+    "compile(", "pickle", "marshal",
+    "socket", "urllib", "requests", "http.client", "https.client"
+]
+
+
 class SecurityChecker:
     def __init__(self):
         self.config = load_config()
@@ -58,8 +85,7 @@ class SecurityChecker:
         
         # 检查文件写入操作
         if "open(" in code_lower:
-            write_modes = ["'w'", '"w"', "'a'", '"a"', "'x'", '"x"']
-            has_write_mode = any(mode in code_lower for mode in write_modes)
+            has_write_mode = any(mode in code_lower for mode in WRITE_MODES)
             if has_write_mode:
                 # 提取文件路径
                 files = self._extract_file_paths(code, ["open("])
@@ -68,22 +94,10 @@ class SecurityChecker:
                 return "检测到文件写入操作，是否确认执行？"
         
         # 检查文件删除操作
-        dangerous_delete_patterns = [
-            "os.remove",
-            "os.unlink",
-            "os.rmdir",
-            "os.removedirs",
-            "shutil.rmtree",
-            ".unlink",
-            ".remove",
-            ".rmdir",
-            ".removedirs"
-        ]
-        
         has_delete_operation = False
         delete_files = set()
         
-        for operation in dangerous_delete_patterns:
+        for operation in DANGEROUS_DELETE_PATTERNS:
             if operation in code_lower:
                 has_delete_operation = True
                 # 提取要删除的文件路径
@@ -96,8 +110,7 @@ class SecurityChecker:
             return "检测到文件删除操作，是否确认执行？"
         
         # 检查目录操作
-        dangerous_dir_keywords = ["os.mkdir", "os.makedirs", "os.listdir", "os.walk"]
-        for keyword in dangerous_dir_keywords:
+        for keyword in DANGEROUS_DIR_KEYWORDS:
             if keyword in code_lower:
                 # 提取目录路径
                 dirs = self._extract_file_paths(code, [keyword])
@@ -106,13 +119,7 @@ class SecurityChecker:
                 return "检测到目录操作，是否确认执行？"
         
         # 检查其他危险操作
-        dangerous_keywords = [
-            "os.system", "subprocess", "eval(", "exec(", "__import__",
-            "compile(", "pickle", "marshal",
-            "socket", "urllib", "requests", "http.client", "https.client"
-        ]
-        
-        for keyword in dangerous_keywords:
+        for keyword in DANGEROUS_KEYWORDS:
             if keyword in code_lower:
                 return f"检测到危险操作: {keyword}，是否确认执行？"
         
@@ -1,5 +1,11 @@
 import os
+import re
 import glob
+import copy
+import atexit
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
@@ -9,6 +15,8 @@ from .file_operations import FileOperationsTool
 
 try:
     from docx import Document
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
     import docx2pdf
     from pypdf import PdfReader
     import io
@@ -19,6 +27,116 @@ except ImportError:
     PDF_AVAILABLE = False
 
 
+# 页数达到该阈值时才启用多进程提取文本，小文件的进程启动开销得不偿失
+PARALLEL_EXTRACT_MIN_PAGES = 32
+
+# 段落文本中需要转换为单独元素的字符（与 python-docx 设置 run.text 时的处理一致）
+_RUN_SPECIAL_CHARS_RE = re.compile(r'([\t\n\r])')
+
+# 并行提取文本的工作进程数
+EXTRACT_WORKERS = os.cpu_count() or 1
+
+# 模块级共享的进程池：首次需要并行提取时才创建，之后复用，避免每次转换都重新启动工作进程
+_extract_pool: Optional[ProcessPoolExecutor] = None
+_extract_pool_lock = threading.Lock()
+
+
+def _get_extract_pool() -> ProcessPoolExecutor:
+    """获取（必要时创建）共享的文本提取进程池"""
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is None:
+            _extract_pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+        return _extract_pool
+
+
+@atexit.register
+def _shutdown_extract_pool():
+    """进程退出时关闭共享进程池"""
+    if _extract_pool is not None:
+        _extract_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_page_range(pdf_bytes: bytes, start: int, stop: int) -> List[str]:
+    """在工作进程中解析一次 PDF，提取 [start, stop) 范围内各页的文本"""
+    pdf_reader = PdfReader(io.BytesIO(pdf_bytes))
+    return [pdf_reader.pages[page_num].extract_text() or "" for page_num in range(start, stop)]
+
+
+def _extract_pdf_texts(pdf_bytes: bytes) -> List[str]:
+    """提取 PDF 所有页面的文本
+    
+    大文件按页码划分为与进程数相同的连续区间，交给共享进程池并行提取，
+    每个区间只解析一次 xref 表，解析次数从页数降为进程数。
+    """
+    pdf_reader = PdfReader(io.BytesIO(pdf_bytes))
+    page_count = len(pdf_reader.pages)
+    
+    if page_count < PARALLEL_EXTRACT_MIN_PAGES:
+        return [page.extract_text() or "" for page in pdf_reader.pages]
+    
+    executor = _get_extract_pool()
+    chunk_count = min(EXTRACT_WORKERS, page_count)
+    bounds = [page_count * i // chunk_count for i in range(chunk_count + 1)]
+    futures = [
+        executor.submit(_extract_page_range, pdf_bytes, start, stop)
+        for start, stop in zip(bounds, bounds[1:])
+    ]
+    page_texts = []
+    for future in futures:
+        page_texts.extend(future.result())
+    return page_texts
+
+
+def _build_text_paragraph(text: str):
+    """直接构造 <w:p> 元素，制表符转为 <w:tab/>，换行符转为 <w:br/>，与 add_paragraph 的输出一致"""
+    p = OxmlElement('w:p')
+    r = OxmlElement('w:r')
+    for piece in _RUN_SPECIAL_CHARS_RE.split(text):
+        if piece == '\t':
+            r.append(OxmlElement('w:tab'))
+        elif piece == '\n' or piece == '\r':
+            r.append(OxmlElement('w:br'))
+        elif piece:
+            t = OxmlElement('w:t')
+            t.set(qn('xml:space'), 'preserve')
+            t.text = piece
+            r.append(t)
+    p.append(r)
+    return p
+
+
+def _build_page_break_paragraph():
+    """构造分页段落 <w:p><w:r><w:br w:type="page"/></w:r></w:p>"""
+    p = OxmlElement('w:p')
+    r = OxmlElement('w:r')
+    br = OxmlElement('w:br')
+    br.set(qn('w:type'), 'page')
+    r.append(br)
+    p.append(r)
+    return p
+
+
+def _append_pages_to_document(doc, page_texts: List[str]):
+    """将各页文本写入文档正文
+    
+    绕过 add_paragraph/add_page_break 的逐次对象封装，直接构造 XML 元素，
+    插入到正文末尾的 sectPr 之前。分页元素只构造一次，之后深拷贝。
+    """
+    body = doc.element.body
+    sect_pr = body.find(qn('w:sectPr'))
+    insert = sect_pr.addprevious if sect_pr is not None else body.append
+    page_break = _build_page_break_paragraph()
+    page_count = len(page_texts)
+    
+    for page_num, text in enumerate(page_texts):
+        if text:
+            insert(_build_text_paragraph(text))
+        
+        if page_num < page_count - 1:
+            insert(copy.deepcopy(page_break))
+
+
 class DocumentOperationEnum(str, Enum):
     PDF_TO_WORD = "pdf_to_word"
     WORD_TO_PDF = "word_to_pdf"
@@ -77,9 +195,15 @@ class DocumentConverterTool(ToolBase):
         output_processed = FileOperationsTool.process_path_static(output_path)
         
         if '*' in input_processed or '?' in input_processed:
-            return self._batch_convert(operation, input_processed, output_processed)
+            convert = self._batch_convert
+        else:
+            convert = self._single_convert
         
-        return self._single_convert(operation, input_processed, output_processed)
+        # PDF 转 Word 的读取、文本提取和保存都是阻塞操作，放到线程中执行，不阻塞事件循环；
+        # Word 转 PDF 通过 COM 驱动 Word，需要留在调用线程中
+        if operation == 'pdf_to_word':
+            return await asyncio.to_thread(convert, operation, input_processed, output_processed)
+        return convert(operation, input_processed, output_processed)
     
     def _batch_convert(self, operation: str, input_pattern: str, output_path: str) -> Dict[str, Any]:
         matched_files = glob.glob(input_pattern, recursive=False)
@@ -185,18 +309,11 @@ class DocumentConverterTool(ToolBase):
             doc = Document()
             
             with open(input_path, 'rb') as f:
-                pdf_reader = PdfReader(f)
-                page_count = len(pdf_reader.pages)
-                
-                for page_num in range(page_count):
-                    page = pdf_reader.pages[page_num]
-                    text = page.extract_text()
-                    
-                    if text:
-                        doc.add_paragraph(text)
-                    
-                    if page_num < page_count - 1:
-                        doc.add_page_break()
+                pdf_bytes = f.read()
+            
+            page_texts = _extract_pdf_texts(pdf_bytes)
+            page_count = len(page_texts)
+            _append_pages_to_document(doc, page_texts)
             
             doc.save(output_path)
             
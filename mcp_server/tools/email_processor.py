@@ -1,13 +1,22 @@
 import os
+import asyncio
+import base64
+import mmap
 import smtplib
 import imaplib
 import email
+import email.policy
 import socket
+import ssl
 import re
+import atexit
+import threading
+import time
 from enum import Enum
+from email.message import EmailMessage
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from email.mime.application import MIMEApplication
+from email.mime.base import MIMEBase
 from typing import Dict, Any, Optional, List, Tuple
 from mcp.server.fastmcp import Context
 from .tool_base import ToolBase, ToolResult, OperationConfig, register_tool
@@ -16,6 +25,312 @@ from .file_operations import FileOperationsTool
 from user_config.config import get_config
 
 
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+# 附件路径分隔符，分号和逗号均可，允许混用
+_ATT_SEP = re.compile(r'[;,]')
+
+
+def _split_attachments(attachments: str) -> List[str]:
+    """拆分附件路径字符串，去除空白和空项"""
+    return [p.strip() for p in _ATT_SEP.split(attachments) if p.strip()]
+
+
+# 所有 SMTP/IMAP 连接共享的 SSL 上下文，系统 CA 证书只加载一次
+_SSL_CTX = ssl.create_default_context()
+
+# DNS 解析缓存：(主机名, 端口) -> (过期时间, 地址列表)，避免每次建立连接都重新解析
+_DNS_CACHE_TTL = 300
+_dns_cache: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+
+
+def _resolve_host(host: str, port: int) -> List[str]:
+    """解析主机的全部地址并缓存结果，IPv4 地址排在前面"""
+    key = (host, port)
+    cached = _dns_cache.get(key)
+    now = time.monotonic()
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    infos.sort(key=lambda info: info[0] != socket.AF_INET)
+    addresses = list(dict.fromkeys(info[4][0] for info in infos))
+    _dns_cache[key] = (now + _DNS_CACHE_TTL, addresses)
+    return addresses
+
+
+def _connect_cached(host: str, port: int, connect):
+    """依次尝试缓存的每个地址建立连接（与 socket.create_connection 的逐个回退一致）
+    
+    所有地址都连接失败时丢弃缓存，下次连接重新解析，并抛出最后一个错误。
+    """
+    last_error = None
+    for ip in _resolve_host(host, port):
+        try:
+            return connect(ip)
+        except OSError as e:
+            last_error = e
+    _dns_cache.pop((host, port), None)
+    raise last_error
+
+
+class _CachedDNSMixin:
+    """使用 DNS 缓存建立 SMTP 连接
+    
+    只替换 TCP 连接的目标地址；TLS 握手的 SNI 和证书校验仍使用原始主机名（self._host）。
+    """
+    
+    def _get_socket(self, host, port, timeout):
+        get_socket = super()._get_socket
+        return _connect_cached(host, port, lambda ip: get_socket(ip, port, timeout))
+
+
+class _SMTP(_CachedDNSMixin, smtplib.SMTP):
+    pass
+
+
+class _SMTP_SSL(_CachedDNSMixin, smtplib.SMTP_SSL):
+    pass
+
+
+class _IMAP4_SSL(imaplib.IMAP4_SSL):
+    """使用 DNS 缓存建立连接的 IMAP4_SSL，证书校验仍使用原始主机名"""
+    
+    def _create_socket(self, timeout):
+        def connect(ip):
+            if timeout is not None:
+                return socket.create_connection((ip, self.port), timeout)
+            return socket.create_connection((ip, self.port))
+        
+        sock = _connect_cached(self.host, self.port, connect)
+        return self.ssl_context.wrap_socket(sock, server_hostname=self.host)
+
+
+# SMTP 连接池：按 (服务器, 端口, 用户名) 缓存已登录的连接，避免每次发送都重新握手和认证
+_smtp_pool: Dict[Tuple[str, int, str], smtplib.SMTP] = {}
+_smtp_lock = threading.Lock()
+
+
+def _close_smtp(server: smtplib.SMTP):
+    """关闭 SMTP 连接，忽略关闭过程中的错误"""
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+def _acquire_smtp(smtp_server: str, smtp_port: int, smtp_username: str,
+                  smtp_password: str, use_ssl: bool) -> smtplib.SMTP:
+    """从连接池取出可用的 SMTP 连接，没有则新建并登录
+    
+    取出的连接在归还前由调用方独占，smtplib 连接本身不是线程安全的。
+    """
+    key = (smtp_server, smtp_port, smtp_username)
+    with _smtp_lock:
+        server = _smtp_pool.pop(key, None)
+    
+    if server is not None:
+        try:
+            if server.noop()[0] == 250:
+                return server
+        except (smtplib.SMTPException, OSError):
+            pass
+        _close_smtp(server)
+    
+    if use_ssl:
+        server = _SMTP_SSL(smtp_server, smtp_port, timeout=30, context=_SSL_CTX)
+    else:
+        server = _SMTP(smtp_server, smtp_port, timeout=30)
+        server.starttls(context=_SSL_CTX)
+    
+    try:
+        server.login(smtp_username, smtp_password)
+    except Exception:
+        _close_smtp(server)
+        raise
+    return server
+
+
+def _release_smtp(smtp_server: str, smtp_port: int, smtp_username: str, server: smtplib.SMTP):
+    """将 SMTP 连接归还连接池，同一键已有连接时关闭多余的连接"""
+    key = (smtp_server, smtp_port, smtp_username)
+    with _smtp_lock:
+        existing = _smtp_pool.get(key)
+        if existing is None:
+            _smtp_pool[key] = server
+            return
+    _close_smtp(server)
+
+
+@atexit.register
+def _close_smtp_pool():
+    """进程退出时关闭所有池化的 SMTP 连接"""
+    with _smtp_lock:
+        servers = list(_smtp_pool.values())
+        _smtp_pool.clear()
+    for server in servers:
+        _close_smtp(server)
+
+
+# IMAP 连接池：按 (服务器, 端口, 用户名) 缓存已登录并选中 INBOX 的连接
+_imap_pool: Dict[Tuple[str, int, str], imaplib.IMAP4_SSL] = {}
+_imap_lock = threading.Lock()
+
+
+def _close_imap(server: imaplib.IMAP4_SSL):
+    """登出 IMAP 连接，忽略登出过程中的错误"""
+    try:
+        server.logout()
+    except Exception:
+        pass
+
+
+def _acquire_imap(imap_server: str, imap_port: int, username: str, password: str) -> imaplib.IMAP4_SSL:
+    """从连接池取出可用的 IMAP 连接，没有则新建并登录"""
+    key = (imap_server, imap_port, username)
+    with _imap_lock:
+        server = _imap_pool.pop(key, None)
+    
+    if server is not None:
+        try:
+            if server.noop()[0] == 'OK':
+                return server
+        except (imaplib.IMAP4.error, OSError):
+            pass
+        _close_imap(server)
+    
+    server = _IMAP4_SSL(imap_server, imap_port, ssl_context=_SSL_CTX)
+    try:
+        server.login(username, password)
+    except Exception:
+        _close_imap(server)
+        raise
+    return server
+
+
+def _release_imap(imap_server: str, imap_port: int, username: str, server: imaplib.IMAP4_SSL):
+    """将 IMAP 连接归还连接池，同一键已有连接时登出多余的连接"""
+    key = (imap_server, imap_port, username)
+    with _imap_lock:
+        if key not in _imap_pool:
+            _imap_pool[key] = server
+            return
+    _close_imap(server)
+
+
+@atexit.register
+def _close_imap_pool():
+    """进程退出时登出所有池化的 IMAP 连接"""
+    with _imap_lock:
+        servers = list(_imap_pool.values())
+        _imap_pool.clear()
+    for server in servers:
+        _close_imap(server)
+
+
+# base64 分块编码的块大小，必须是 57 的倍数，保证每块编码后恰好是完整的 76 字符行
+_B64_CHUNK_SIZE = 57 * 16 * 1024
+
+
+def _read_attachment_part(path: str) -> MIMEBase:
+    """读取附件文件并构造 MIME 附件段
+    
+    通过 mmap 映射文件并分块 base64 编码，省去原始字节的完整副本；
+    编码后的内容（约为文件大小的 1.37 倍）仍整体保存在内存中，发送时 as_string() 还会再复制一次，
+    因此内存占用并不受限于固定大小。文件不存在时抛出 FileNotFoundError。
+    """
+    filename = os.path.basename(path)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                payload = "".join(
+                    base64.encodebytes(mm[offset:offset + _B64_CHUNK_SIZE]).decode('ascii')
+                    for offset in range(0, size, _B64_CHUNK_SIZE)
+                )
+        else:
+            payload = ""
+    
+    part = MIMEBase('application', 'octet-stream')
+    part.set_payload(payload)
+    part['Content-Transfer-Encoding'] = 'base64'
+    part.add_header('Content-Disposition', 'attachment', filename=filename)
+    return part
+
+
+async def _load_attachment(path: str) -> Tuple[Optional[MIMEBase], Optional[str]]:
+    """在工作线程中读取附件，文件不存在时返回缺失的路径而不是抛出异常"""
+    try:
+        return await asyncio.to_thread(_read_attachment_part, path), None
+    except FileNotFoundError:
+        return None, path
+
+
+# 接收邮件时 FETCH 的数据项：邮件头中只取展示和解析 MIME 结构所需的字段，加上正文
+_FETCH_ITEMS = (
+    '(BODY.PEEK[HEADER.FIELDS (FROM TO SUBJECT DATE MIME-VERSION CONTENT-TYPE CONTENT-TRANSFER-ENCODING)] '
+    'BODY.PEEK[TEXT])'
+)
+
+
+def _iter_fetched_messages(msg_data: list):
+    """将 FETCH 响应按邮件拼接为 "头字段 + 正文" 的原始字节
+    
+    每封邮件的响应由若干 (描述, 数据) 元组组成，并以 b')' 结尾；
+    服务器返回数据项的顺序不固定，按描述中是否包含 HEADER 区分。
+    """
+    header = b""
+    text = b""
+    has_data = False
+    for response_part in msg_data:
+        if isinstance(response_part, tuple):
+            if b"HEADER" in response_part[0].upper():
+                header = response_part[1] or b""
+            else:
+                text = response_part[1] or b""
+            has_data = True
+        elif has_data and response_part and response_part.endswith(b")"):
+            yield header + text
+            header = b""
+            text = b""
+            has_data = False
+    if has_data:
+        yield header + text
+
+
+def _header_str(msg: EmailMessage, name: str) -> Optional[str]:
+    """读取邮件头并转为普通字符串（policy.default 会解码 RFC 2047 编码）"""
+    value = msg.get(name)
+    return str(value) if value is not None else None
+
+
+def _get_plain_body(msg: EmailMessage) -> str:
+    """提取纯文本正文
+    
+    get_body 只沿 multipart 结构查找正文候选，跳过附件，不会像 walk() 那样遍历所有子部分。
+    """
+    body_part = msg.get_body(preferencelist=('plain',))
+    if body_part is None:
+        return ""
+    try:
+        return body_part.get_content()
+    except LookupError:
+        # 未知字符集，按 UTF-8 宽松解码
+        payload = body_part.get_payload(decode=True) or b""
+        return payload.decode('utf-8', errors='replace')
+
+
+def _format_message_set(email_ids: List[bytes]) -> bytes:
+    """将邮件序号列表格式化为 IMAP 消息集合，连续序号使用 first:last 区间"""
+    first = int(email_ids[0])
+    last = int(email_ids[-1])
+    if last - first + 1 == len(email_ids):
+        return b'%d:%d' % (first, last)
+    return b','.join(email_ids)
+
+
 class EmailOperationEnum(str, Enum):
     SEND = "send"
     RECEIVE = "receive"
@@ -45,9 +360,12 @@ class EmailProcessorTool(ToolBase):
         )
     }
     
+    def __init__(self):
+        super().__init__()
+        self.refresh_defaults()
+    
     def _validate_email(self, email_address: str) -> bool:
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email_address))
+        return bool(_EMAIL_RE.match(email_address))
     
     def _get_email_provider(self, smtp_server: str) -> str:
         if "163.com" in smtp_server:
@@ -56,38 +374,63 @@ class EmailProcessorTool(ToolBase):
             return "qq"
         return "unknown"
     
-    def _get_smtp_config(self, smtp_server: Optional[str], smtp_port: Optional[int], 
-                          smtp_username: Optional[str], smtp_password: Optional[str]) -> Tuple[str, int, str, str]:
-        smtp_server = smtp_server or os.getenv('SMTP_SERVER', '') or get_config("email.smtp.server", "smtp.example.com")
+    def refresh_defaults(self):
+        """读取环境变量和配置文件中的邮件默认参数
         
-        email_provider = self._get_email_provider(smtp_server)
+        在工具注册时调用一次，之后每次调用直接使用缓存的默认值；
+        环境变量或配置变更后可再次调用以重新加载。
+        """
+        config_username = get_config("email.smtp.username", "")
+        config_password = get_config("email.smtp.password", "")
+        env_username = os.getenv('SMTP_USERNAME', '')
+        env_password = os.getenv('SMTP_PASSWORD', '')
         
+        self._default_smtp_server = os.getenv('SMTP_SERVER', '') or get_config("email.smtp.server", "smtp.example.com")
+        self._default_smtp_port = self._env_port('SMTP_PORT') or get_config("email.smtp.port", 465)
+        # SMTP 调试输出级别（0 关闭，1 输出命令，2 附带时间戳），每行都会同步写 stderr，默认关闭
+        self._smtp_debuglevel = int(get_config("email.smtp.debug", 0))
+        # 各邮件服务商的默认用户名和密码：服务商专用环境变量 > 通用环境变量 > 配置文件
+        self._default_credentials = {
+            "163": (
+                os.getenv('SMTP_163_USERNAME', '') or env_username or config_username,
+                os.getenv('SMTP_163_PASSWORD', '') or env_password or config_password
+            ),
+            "qq": (
+                os.getenv('SMTP_QQ_USERNAME', '') or env_username or config_username,
+                os.getenv('SMTP_QQ_PASSWORD', '') or env_password or config_password
+            ),
+            "unknown": (
+                env_username or config_username,
+                env_password or config_password
+            )
+        }
+        self._default_imap_server = os.getenv('IMAP_SERVER', '') or get_config("email.imap.server", "")
+        self._default_imap_port = self._env_port('IMAP_PORT') or get_config("email.imap.port", 993)
+    
+    @staticmethod
+    def _env_port(name: str) -> Optional[int]:
+        value = os.getenv(name, '')
+        if not value:
+            return None
         try:
-            smtp_port = smtp_port or int(os.getenv('SMTP_PORT', '')) if os.getenv('SMTP_PORT', '') else None
+            return int(value)
         except ValueError:
-            smtp_port = None
-        smtp_port = smtp_port or get_config("email.smtp.port", 465)
+            return None
+    
+    def _get_smtp_config(self, smtp_server: Optional[str], smtp_port: Optional[int], 
+                          smtp_username: Optional[str], smtp_password: Optional[str]) -> Tuple[str, int, str, str]:
+        smtp_server = smtp_server or self._default_smtp_server
+        smtp_port = smtp_port or self._default_smtp_port
         
-        if email_provider == "163":
-            smtp_username = smtp_username or os.getenv('SMTP_163_USERNAME', '') or os.getenv('SMTP_USERNAME', '') or get_config("email.smtp.username", "")
-            smtp_password = smtp_password or os.getenv('SMTP_163_PASSWORD', '') or os.getenv('SMTP_PASSWORD', '') or get_config("email.smtp.password", "")
-        elif email_provider == "qq":
-            smtp_username = smtp_username or os.getenv('SMTP_QQ_USERNAME', '') or os.getenv('SMTP_USERNAME', '') or get_config("email.smtp.username", "")
-            smtp_password = smtp_password or os.getenv('SMTP_QQ_PASSWORD', '') or os.getenv('SMTP_PASSWORD', '') or get_config("email.smtp.password", "")
-        else:
-            smtp_username = smtp_username or os.getenv('SMTP_USERNAME', '') or get_config("email.smtp.username", "")
-            smtp_password = smtp_password or os.getenv('SMTP_PASSWORD', '') or get_config("email.smtp.password", "")
+        default_username, default_password = self._default_credentials[self._get_email_provider(smtp_server)]
+        smtp_username = smtp_username or default_username
+        smtp_password = smtp_password or default_password
         
         return smtp_server, smtp_port, smtp_username, smtp_password
     
     def _get_imap_config(self, imap_server: Optional[str], imap_port: Optional[int]) -> Tuple[str, int]:
-        imap_server = imap_server or os.getenv('IMAP_SERVER', '') or get_config("email.imap.server", "")
-        
-        try:
-            imap_port = imap_port or int(os.getenv('IMAP_PORT', '')) if os.getenv('IMAP_PORT', '') else None
-        except ValueError:
-            imap_port = None
-        imap_port = imap_port or get_config("email.imap.port", 993)
+        imap_server = imap_server or self._default_imap_server
+        imap_port = imap_port or self._default_imap_port
         
         return imap_server, imap_port
     
@@ -133,24 +476,26 @@ class EmailProcessorTool(ToolBase):
         if operation == 'send':
             if not await self._confirm_with_permission(
                 ctx,
-                f"确认发送邮件\n📧 收件人: {recipient}\n📝 主题: {subject or '无'}\n📎 附件: {f'（含{len(attachments.split(';')) if attachments else 0}个附件）' if attachments else ''}\n🌐 服务器: {smtp_server}:{smtp_port}",
+                f"确认发送邮件\n📧 收件人: {recipient}\n📝 主题: {subject or '无'}\n📎 附件: {f'（含{len(_split_attachments(attachments))}个附件）' if attachments else ''}\n🌐 服务器: {smtp_server}:{smtp_port}",
                 **kwargs
             ):
                 return ToolResult.error("用户取消发送邮件").build()
             
-            return self._send_email(
+            return await self._send_email(
                 recipient, subject, body, attachments,
                 smtp_server, smtp_port, smtp_username, smtp_password
             )
         elif operation == 'receive':
             imap_server, imap_port = self._get_imap_config(imap_server, imap_port)
-            return self._receive_email(
+            # imaplib 为阻塞 I/O，放到工作线程执行，避免阻塞事件循环
+            return await asyncio.to_thread(
+                self._receive_email,
                 recipient, imap_server, imap_port, smtp_username, smtp_password
             )
         else:
             return ToolResult.error(f"不支持的操作: {operation}").build()
     
-    def _send_email(self, recipient: str, subject: str, body: str, attachments: Optional[str],
+    async def _send_email(self, recipient: str, subject: str, body: str, attachments: Optional[str],
                     smtp_server: str, smtp_port: int, smtp_username: str, smtp_password: str) -> Dict[str, Any]:
         if not smtp_username:
             return ToolResult.error("缺少SMTP用户名，请在配置文件中设置或直接提供").build()
@@ -167,43 +512,31 @@ class EmailProcessorTool(ToolBase):
             
             attachment_count = 0
             if attachments:
-                attachment_paths = [p.strip() for p in attachments.split(";" if ";" in attachments else ",")]
-                for attachment_path in attachment_paths:
-                    if attachment_path:
-                        processed_path = FileOperationsTool.process_path_static(attachment_path)
-                        
-                        if not os.path.exists(processed_path):
-                            return (ToolResult.error(f"附件文件不存在: {processed_path}")
-                                .with_message(f"❌ 错误: 附件文件不存在\n📄 文件: {os.path.basename(processed_path)}\n📍 路径: {processed_path}")
-                                .build())
-                        
-                        attachment_count += 1
-                        with open(processed_path, 'rb') as f:
-                            part = MIMEApplication(f.read())
-                            part.add_header('Content-Disposition', 'attachment', filename=os.path.basename(processed_path))
-                            msg.attach(part)
-            
-            email_provider = self._get_email_provider(smtp_server)
-            
-            try:
-                if email_provider == "163":
-                    server = smtplib.SMTP_SSL(smtp_server, 465, timeout=30)
-                else:
-                    if smtp_port == 465:
-                        server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=30)
-                    else:
-                        server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
-                        server.starttls()
+                processed_paths = [
+                    FileOperationsTool.process_path_static(attachment_path)
+                    for attachment_path in _split_attachments(attachments)
+                ]
                 
-                server.set_debuglevel(2)
-                server.login(smtp_username, smtp_password)
-                server.sendmail(smtp_username, recipient, msg.as_string())
-                server.quit()
-            finally:
-                try:
-                    server.quit()
-                except:
-                    pass
+                # 并发读取所有附件，总耗时取决于最慢的文件而非所有文件之和；
+                # 每个附件返回 (附件段, 缺失路径)，全部完成后按输入顺序报告第一个缺失的文件
+                results = await asyncio.gather(
+                    *(_load_attachment(processed_path) for processed_path in processed_paths)
+                )
+                for _, missing_path in results:
+                    if missing_path:
+                        return (ToolResult.error(f"附件文件不存在: {missing_path}")
+                            .with_message(f"❌ 错误: 附件文件不存在\n📄 文件: {os.path.basename(missing_path)}\n📍 路径: {missing_path}")
+                            .build())
+                parts = [part for part, _ in results]
+                for part in parts:
+                    msg.attach(part)
+                attachment_count = len(parts)
+            
+            # smtplib 为阻塞 I/O，放到工作线程执行，避免阻塞事件循环
+            await asyncio.to_thread(
+                self._deliver_message, msg, recipient,
+                smtp_server, smtp_port, smtp_username, smtp_password
+            )
             
             return (ToolResult.success(f"邮件发送成功，收件人: {recipient}")
                 .with_message(f"✅ 邮件发送成功\n📧 收件人: {recipient}\n📤 发件人: {smtp_username}\n📝 主题: {subject or '无'}\n📎 附件数: {attachment_count}\n🌐 服务器: {smtp_server}:{smtp_port}")
@@ -228,6 +561,27 @@ class EmailProcessorTool(ToolBase):
         except Exception as e:
             return ToolResult.error(f"发送邮件失败: {str(e)}").build()
     
+    def _deliver_message(self, msg: MIMEMultipart, recipient: str, smtp_server: str, smtp_port: int,
+                         smtp_username: str, smtp_password: str):
+        email_provider = self._get_email_provider(smtp_server)
+        
+        if email_provider == "163":
+            connect_port = 465
+        else:
+            connect_port = smtp_port
+        use_ssl = connect_port == 465
+        
+        server = _acquire_smtp(smtp_server, connect_port, smtp_username, smtp_password, use_ssl)
+        try:
+            if self._smtp_debuglevel:
+                server.set_debuglevel(self._smtp_debuglevel)
+            server.sendmail(smtp_username, [recipient], msg.as_string())
+        except Exception:
+            # 连接状态未知，不再放回连接池
+            _close_smtp(server)
+            raise
+        _release_smtp(smtp_server, connect_port, smtp_username, server)
+    
     def _receive_email(self, recipient: str, imap_server: str, imap_port: int,
                        smtp_username: str, smtp_password: str) -> Dict[str, Any]:
         if not smtp_username:
@@ -239,67 +593,71 @@ class EmailProcessorTool(ToolBase):
             return ToolResult.error("接收邮件需要提供IMAP服务器地址和端口").build()
         
         try:
-            with imaplib.IMAP4_SSL(imap_server, imap_port) as server:
-                server.login(smtp_username, smtp_password)
+            server = _acquire_imap(imap_server, imap_port, smtp_username, smtp_password)
+        except Exception as e:
+            return ToolResult.error(f"接收邮件失败: {str(e)}").build()
+        
+        try:
+            # 池化的连接只会选中 INBOX，已处于 SELECTED 状态时无需重复 SELECT
+            if server.state != 'SELECTED':
                 server.select('INBOX')
-                
-                status, messages = server.search(None, f'FROM "{recipient}"')
-                
+            
+            status, messages = server.search(None, f'FROM "{recipient}"')
+            
+            if status != 'OK':
+                _release_imap(imap_server, imap_port, smtp_username, server)
+                return ToolResult.error("搜索邮件失败").build()
+            
+            email_ids = messages[0].split()
+            email_ids = email_ids[-10:]
+            
+            # 按字段分别存放，只在构造返回结果时组合成每封邮件一个字典
+            froms, tos, subjects, dates, bodies = [], [], [], [], []
+            if email_ids:
+                # 一次 FETCH 取回所有邮件，避免逐封请求的网络往返
+                # 只取需要的头字段和正文；BODY.PEEK 不会把邮件标记为已读
+                status, msg_data = server.fetch(_format_message_set(email_ids), _FETCH_ITEMS)
                 if status != 'OK':
-                    return ToolResult.error("搜索邮件失败").build()
+                    msg_data = []
                 
-                email_ids = messages[0].split()
-                email_ids = email_ids[-10:]
-                
-                received_emails = []
-                for email_id in email_ids:
-                    status, msg_data = server.fetch(email_id, '(RFC822)')
-                    if status != 'OK':
-                        continue
-                    
-                    for response_part in msg_data:
-                        if isinstance(response_part, tuple):
-                            msg = email.message_from_bytes(response_part[1])
-                            
-                            email_info = {
-                                "from": msg.get('From'),
-                                "to": msg.get('To'),
-                                "subject": msg.get('Subject'),
-                                "date": msg.get('Date'),
-                                "body": ""
-                            }
-                            
-                            if msg.is_multipart():
-                                for part in msg.walk():
-                                    if part.get_content_type() == 'text/plain' and not part.get('Content-Disposition'):
-                                        email_info["body"] = part.get_payload(decode=True).decode('utf-8', errors='replace')
-                                        break
-                            else:
-                                if msg.get_content_type() == 'text/plain':
-                                    email_info["body"] = msg.get_payload(decode=True).decode('utf-8', errors='replace')
-                            
-                            received_emails.append(email_info)
-                
-                formatted_msg = f"✅ 成功接收 {len(received_emails)} 封邮件\n📧 发件人: {recipient}\n📥 收件箱: {smtp_username}"
-                if received_emails:
-                    formatted_msg += "\n\n📋 邮件列表:"
-                    for i, email_info in enumerate(received_emails[:3], 1):
-                        formatted_msg += f"\n\n{i}. 主题: {email_info['subject'] or '无'}"
-                        formatted_msg += f"\n   日期: {email_info['date'] or '未知'}"
-                        formatted_msg += f"\n   发件人: {email_info['from'] or '未知'}"
-                        if len(email_info['body']) > 100:
-                            formatted_msg += f"\n   正文: {email_info['body'][:100]}..."
-                        else:
-                            formatted_msg += f"\n   正文: {email_info['body'] or '无'}"
-                    if len(received_emails) > 3:
-                        formatted_msg += f"\n\n... 还有 {len(received_emails) - 3} 封邮件未显示"
-                
-                return (ToolResult.success(f"成功接收 {len(received_emails)} 封邮件")
-                    .with_extra("emails", received_emails)
-                    .with_message(formatted_msg)
-                    .build())
+                for raw_message in _iter_fetched_messages(msg_data):
+                    msg = email.message_from_bytes(raw_message, policy=email.policy.default)
+                    froms.append(_header_str(msg, 'From'))
+                    tos.append(_header_str(msg, 'To'))
+                    subjects.append(_header_str(msg, 'Subject'))
+                    dates.append(_header_str(msg, 'Date'))
+                    bodies.append(_get_plain_body(msg))
+            
+            email_count = len(subjects)
+            formatted_msg = f"✅ 成功接收 {email_count} 封邮件\n📧 发件人: {recipient}\n📥 收件箱: {smtp_username}"
+            if email_count:
+                formatted_msg += "\n\n📋 邮件列表:"
+                for i in range(min(email_count, 3)):
+                    body = bodies[i]
+                    formatted_msg += f"\n\n{i + 1}. 主题: {subjects[i] or '无'}"
+                    formatted_msg += f"\n   日期: {dates[i] or '未知'}"
+                    formatted_msg += f"\n   发件人: {froms[i] or '未知'}"
+                    if len(body) > 100:
+                        formatted_msg += f"\n   正文: {body[:100]}..."
+                    else:
+                        formatted_msg += f"\n   正文: {body or '无'}"
+                if email_count > 3:
+                    formatted_msg += f"\n\n... 还有 {email_count - 3} 封邮件未显示"
+            
+            received_emails = [
+                {"from": sender, "to": to, "subject": subject, "date": date, "body": body}
+                for sender, to, subject, date, body in zip(froms, tos, subjects, dates, bodies)
+            ]
+            
+            _release_imap(imap_server, imap_port, smtp_username, server)
+            return (ToolResult.success(f"成功接收 {email_count} 封邮件")
+                .with_extra("emails", received_emails)
+                .with_message(formatted_msg)
+                .build())
         
         except Exception as e:
+            # 连接状态未知，不再放回连接池
+            _close_imap(server)
             return ToolResult.error(f"接收邮件失败: {str(e)}").build()
 
 
@@ -1,5 +1,9 @@
 import os
+import re
+import asyncio
 import shutil
+import fnmatch
+import functools
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple, List
 from enum import Enum
@@ -14,6 +18,52 @@ except ImportError:
     DOCX_AVAILABLE = False
 
 
+# 桌面路径在进程生命周期内不变，导入时计算一次
+DESKTOP_PATH = str(Path.home() / "Desktop")
+
+# 文件搜索的最大结果数和最大目录深度
+SEARCH_MAX_RESULTS = 50
+SEARCH_MAX_DEPTH = 10
+
+
+def _fast_copy(src: str, dst: str) -> str:
+    """复制文件内容和元数据，行为与 shutil.copy2 一致
+    
+    支持 os.copy_file_range 的平台（Linux）在内核中完成数据复制，
+    支持的文件系统上可直接共享数据块（reflink）；其他情况回退到 shutil.copyfile。
+    
+    Returns:
+        实际的目标文件路径
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    
+    # 必须在以 'wb' 打开目标文件之前检查：源和目标是同一文件时打开即会清空源文件
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    
+    copied = False
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    sent = copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if sent == 0:
+                        break
+                    remaining -= sent
+            copied = remaining == 0
+        except OSError:
+            copied = False
+    
+    if not copied:
+        # 源文件未被改动，从头重新复制，覆盖可能只写入了一部分的目标文件
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+    return dst
+
+
 class FileOperationEnum(str, Enum):
     CREATE = "create"
     READ = "read"
@@ -108,6 +158,19 @@ class FileOperationsTool(ToolBase):
     def __init__(self, security_checker: Optional[SecurityChecker] = None):
         super().__init__()
         self.security_checker = security_checker or create_default_security_checker()
+        # 操作分发表，注册时构建一次，按操作名直接查找处理函数
+        self._operation_handlers = {
+            "create": self._op_create,
+            "write": self._op_write,
+            "read": self._op_read,
+            "delete": self._op_delete,
+            "move": self._op_move,
+            "copy": self._op_copy,
+            "list": self._op_list,
+            "search": self._op_search,
+            "check_permission": self._op_check_permission,
+            "read_write": self._op_read_write,
+        }
     
     @classmethod
     def validate_parameters(cls, operation: str, **kwargs) -> Tuple[Dict[str, Any], Optional[str]]:
@@ -125,10 +188,14 @@ class FileOperationsTool(ToolBase):
         return params, config_error
     
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def process_path_static(path: str) -> str:
-        """静态方法：处理文件路径，支持桌面路径、相对路径和绝对路径"""
+        """静态方法：处理文件路径，支持桌面路径、相对路径和绝对路径
+        
+        结果只取决于输入字符串，按路径缓存。
+        """
         path = os.path.expanduser(path)
-        desktop_path = str(Path.home() / "Desktop")
+        desktop_path = DESKTOP_PATH
         
         if path == "桌面" or path == "desktop":
             return desktop_path
@@ -235,10 +302,7 @@ class FileOperationsTool(ToolBase):
         """执行文件操作"""
         operation = kwargs.get('operation')
         path = kwargs.get('path')
-        content = kwargs.get('content')
         destination = kwargs.get('destination')
-        overwrite = kwargs.get('overwrite', True)
-        mode = kwargs.get('mode')
         
         processed_path = self._process_path(path)
         
@@ -248,43 +312,60 @@ class FileOperationsTool(ToolBase):
         if not is_safe:
             return error_result
         
-        if operation == "create":
-            return self._create(processed_path)
-        elif operation == "write":
-            return self._write(processed_path, content, overwrite)
-        elif operation == "read":
-            return self._read(processed_path)
-        elif operation == "delete":
-            if not await self._confirm_with_permission(
-                ctx,
-                f"确认删除文件/文件夹\n📄 文件: {os.path.basename(processed_path)}\n📍 路径: {processed_path}",
-                **kwargs
-            ):
-                return ToolResult.error("用户取消删除").build()
-            
-            return self._delete(processed_path)
-        elif operation == "move":
-            processed_destination = self._process_path(destination)
-            if not await self._confirm_with_permission(
-                ctx,
-                f"确认移动文件/文件夹\n📄 源文件: {os.path.basename(processed_path)}\n📍 源路径: {processed_path}\n📄 目标文件: {os.path.basename(processed_destination)}\n📍 目标路径: {processed_destination}",
-                **kwargs
-            ):
-                return ToolResult.error("用户取消移动").build()
-            
-            return self._move(processed_path, destination)
-        elif operation == "copy":
-            return self._copy(processed_path, destination)
-        elif operation == "list":
-            return self._list(processed_path)
-        elif operation == "search":
-            return self._search(processed_path, content)
-        elif operation == "check_permission":
-            return self._check_permission(processed_path)
-        elif operation == "read_write":
-            return self._read_write(processed_path, content, mode)
-        else:
+        # 各操作的文件 I/O 在工作线程中执行，避免阻塞事件循环
+        handler = self._operation_handlers.get(operation)
+        if handler is None:
             return ToolResult.error(f"不支持的操作: {operation}").build()
+        return await handler(processed_path, ctx, **kwargs)
+    
+    async def _op_create(self, processed_path: str, ctx: Optional[Context], **kwargs) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._create, processed_path)
+    
+    async def _op_write(self, processed_path: str, ctx: Optional[Context], **kwargs) -> Dict[str, Any]:
+        content = kwargs.get('content')
+        # 未指定时默认覆盖写入
+        overwrite = kwargs.get('overwrite', True)
+        return await asyncio.to_thread(self._write, processed_path, content, overwrite)
+    
+    async def _op_read(self, processed_path: str, ctx: Optional[Context], **kwargs) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._read, processed_path)
+    
+    async def _op_delete(self, processed_path: str, ctx: Optional[Context], **kwargs) -> Dict[str, Any]:
+        if not await self._confirm_with_permission(
+            ctx,
+            f"确认删除文件/文件夹\n📄 文件: {os.path.basename(processed_path)}\n📍 路径: {processed_path}",
+            **kwargs
+        ):
+            return ToolResult.error("用户取消删除").build()
+        
+        return await asyncio.to_thread(self._delete, processed_path)
+    
+    async def _op_move(self, processed_path: str, ctx: Optional[Context], **kwargs) -> Dict[str, Any]:
+        destination = kwargs.get('destination')
+        processed_destination = self._process_path(destination)
+        if not await self._confirm_with_permission(
+            ctx,
+            f"确认移动文件/文件夹\n📄 源文件: {os.path.basename(processed_path)}\n📍 源路径: {processed_path}\n📄 目标文件: {os.path.basename(processed_destination)}\n📍 目标路径: {processed_destination}",
+            **kwargs
+        ):
+            return ToolResult.error("用户取消移动").build()
+        
+        return await asyncio.to_thread(self._move, processed_path, destination)
+    
+    async def _op_copy(self, processed_path: str, ctx: Optional[Context], **kwargs) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._copy, processed_path, kwargs.get('destination'))
+    
+    async def _op_list(self, processed_path: str, ctx: Optional[Context], **kwargs) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._list, processed_path)
+    
+    async def _op_search(self, processed_path: str, ctx: Optional[Context], **kwargs) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._search, processed_path, kwargs.get('content'))
+    
+    async def _op_check_permission(self, processed_path: str, ctx: Optional[Context], **kwargs) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._check_permission, processed_path)
+    
+    async def _op_read_write(self, processed_path: str, ctx: Optional[Context], **kwargs) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._read_write, processed_path, kwargs.get('content'), kwargs.get('mode'))
     
     def _create(self, processed_path: str) -> Dict[str, Any]:
         """创建文件/文件夹"""
@@ -446,7 +527,7 @@ class FileOperationsTool(ToolBase):
         if is_dir:
             shutil.copytree(processed_path, dest_path, dirs_exist_ok=True)
         else:
-            shutil.copy2(processed_path, dest_path)
+            _fast_copy(processed_path, dest_path)
         
         return (ToolResult.success("复制成功")
             .with_path(dest_path)
@@ -485,18 +566,52 @@ class FileOperationsTool(ToolBase):
             .with_blackboard(items)
             .build())
     
+    def _iter_search_matches(self, dir_path: str, matcher, depth: int):
+        """递归遍历目录，逐个产出文件名匹配的文件路径
+        
+        使用 os.scandir 直接复用目录项中的类型信息，避免 os.walk 对每个条目的额外 stat。
+        与 os.walk 一致：先产出当前目录的文件，再进入子目录，不跟随目录符号链接。
+        """
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            return
+        
+        sub_dirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                if not entry.is_symlink():
+                    sub_dirs.append(entry.path)
+            elif matcher(entry.name.lower()):
+                yield entry.path
+        
+        if depth < SEARCH_MAX_DEPTH:
+            for sub_dir in sub_dirs:
+                yield from self._iter_search_matches(sub_dir, matcher, depth + 1)
+    
     def _search(self, processed_path: str, content: str) -> Dict[str, Any]:
-        """搜索文件"""
+        """搜索文件
+        
+        关键词按文件名子串匹配（不区分大小写），包含 * ? [ 时按通配符匹配；
+        找到 SEARCH_MAX_RESULTS 个结果后停止遍历。
+        """
         matches = []
-        for root, dirs, files in os.walk(processed_path):
-            depth = root[len(processed_path):].count(os.sep)
-            if depth > 10:
-                dirs[:] = []
-                continue
+        if content:
+            needle = content.lower()
+            if any(ch in needle for ch in "*?["):
+                matcher = re.compile(fnmatch.translate(needle)).match
+            else:
+                matcher = needle.__contains__
             
-            for file in files:
-                if content and content.lower() in file.lower():
-                    matches.append(os.path.join(root, file))
+            for match in self._iter_search_matches(processed_path, matcher, 0):
+                matches.append(match)
+                if len(matches) >= SEARCH_MAX_RESULTS:
+                    break
         
         formatted_matches = []
         for match in matches[:10]:
@@ -504,13 +619,14 @@ class FileOperationsTool(ToolBase):
         if len(matches) > 10:
             formatted_matches.append(f"  ... 等{len(matches) - 10}个文件")
         
-        message = f"🔍 搜索结果\n📍 搜索路径: {processed_path}\n🔤 搜索关键词: {content}\n📊 找到 {len(matches)} 个匹配文件\n\n" + "\n".join(formatted_matches)
+        match_count = f"至少 {len(matches)}" if len(matches) >= SEARCH_MAX_RESULTS else f"{len(matches)}"
+        message = f"🔍 搜索结果\n📍 搜索路径: {processed_path}\n🔤 搜索关键词: {content}\n📊 找到 {match_count} 个匹配文件\n\n" + "\n".join(formatted_matches)
         
-        return (ToolResult.success(matches[:50])
+        return (ToolResult.success(matches)
             .with_path(processed_path)
             .with_extra("total_matches", len(matches))
             .with_message(message)
-            .with_blackboard(matches[:50])
+            .with_blackboard(matches)
             .build())
     
     def _check_permission(self, processed_path: str) -> Dict[str, Any]:
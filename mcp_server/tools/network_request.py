@@ -1,8 +1,187 @@
+import os
+import atexit
+import asyncio
+import json
 from enum import Enum
 from typing import Dict, Any, Optional, Tuple
 from mcp.server.fastmcp import Context
 from .tool_base import ToolBase, ToolResult, OperationConfig, register_tool
 
+try:
+    # orjson 可直接解析 bytes，速度明显快于标准库 json
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# 模块级共享的 ClientSession：复用连接池和 keep-alive 连接，避免每次请求都重新握手
+_session = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+_session_lock: Optional[asyncio.Lock] = None
+
+
+async def _get_session():
+    """获取共享的 aiohttp.ClientSession，首次调用时在当前事件循环中创建"""
+    global _session, _session_loop, _session_lock
+    import aiohttp
+    
+    loop = asyncio.get_running_loop()
+    if _session_lock is None or _session_loop is not loop:
+        # 锁和会话都绑定事件循环，事件循环变化时重新创建
+        _session_lock = asyncio.Lock()
+    
+    async with _session_lock:
+        if _session is None or _session.closed or _session_loop is not loop:
+            if _session_loop is not loop:
+                _close_orphaned_session(_session, _session_loop)
+            _session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=30)
+            )
+            _session_loop = loop
+        return _session
+
+
+def _close_orphaned_session(session, loop: Optional[asyncio.AbstractEventLoop]):
+    """关闭属于其他事件循环的旧会话，避免其连接泄漏"""
+    if session is None or session.closed:
+        return
+    try:
+        if loop is not None and loop.is_running():
+            # 旧事件循环仍在其他线程中运行，交给它自己关闭
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        # 旧事件循环已停止，无法再在其中等待：直接关闭连接器的连接，并将会话标记为已关闭
+        session.connector.close()
+        session.detach()
+    except Exception:
+        pass
+
+
+async def close_session():
+    """关闭共享的 ClientSession"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+@atexit.register
+def _close_session_at_exit():
+    """进程退出时，若会话所属的事件循环仍可用，则关闭共享会话"""
+    if _session is None or _session.closed or _session_loop is None:
+        return
+    if _session_loop.is_closed() or _session_loop.is_running():
+        return
+    try:
+        _session_loop.run_until_complete(close_session())
+    except Exception:
+        pass
+
+
+# 同时进行中的请求上限，突发调用时避免占满连接池、反复进行 DNS 解析和 TLS 握手
+_MAX_CONCURRENCY = int(os.getenv('NETWORK_MAX_CONCURRENCY', '32'))
+_semaphore: Optional[asyncio.Semaphore] = None
+_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """获取当前事件循环的并发信号量；与会话一样，事件循环变化时重新创建"""
+    global _semaphore, _semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore_loop is not loop:
+        _semaphore = asyncio.Semaphore(_MAX_CONCURRENCY)
+        _semaphore_loop = loop
+    return _semaphore
+
+
+# 可选的 HTTP 后端：设置 NETWORK_HTTP_BACKEND=arequest 时使用 arequest（httptools + orjson），
+# 未安装时回退到 aiohttp
+_HTTP_BACKEND = os.getenv('NETWORK_HTTP_BACKEND', 'aiohttp').lower()
+_arequest_session = None
+
+if _HTTP_BACKEND == 'arequest':
+    try:
+        import arequest as _http
+    except ImportError:
+        _http = None
+else:
+    _http = None
+
+
+async def _read_limited(stream, limit: int) -> bytes:
+    """从响应流中最多读取 limit 个字节"""
+    chunks = []
+    remaining = limit
+    while remaining > 0:
+        chunk = await stream.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+async def _request_aiohttp(method, url, data, headers, params,
+                           read_body: bool = True, max_bytes: int = 0) -> Tuple[int, Any, str]:
+    """通过共享的 aiohttp 会话发送请求，返回 (状态码, 响应数据, 错误时的响应文本)"""
+    session = await _get_session()
+    
+    async with session.request(
+        method=method,
+        url=url,
+        json=data,
+        headers=headers,
+        params=params
+    ) as response:
+        if not read_body:
+            # 只关心状态码时不读取响应体，退出上下文时直接释放连接
+            return response.status, None, ""
+        
+        # 只读取一次响应体，按 Content-Type 决定是否解析为 JSON
+        if max_bytes:
+            raw = await _read_limited(response.content, max_bytes)
+            # 响应体未完整读取时 get_encoding() 无法推断编码，只使用声明的字符集
+            encoding = response.charset or "utf-8"
+        else:
+            raw = await response.read()
+            encoding = response.get_encoding()
+        
+        is_json = "json" in response.headers.get("Content-Type", "")
+        if is_json:
+            try:
+                response_data = _json_loads(raw)
+            except ValueError:
+                is_json = False
+        if not is_json:
+            response_data = raw.decode(encoding, errors="replace")
+        
+        response_text = ""
+        if response.status >= 400:
+            response_text = response_data if not is_json else raw.decode(encoding, errors="replace")
+        return response.status, response_data, response_text
+
+
+async def _request_arequest(method, url, data, headers, params,
+                            read_body: bool = True, max_bytes: int = 0) -> Tuple[int, Any, str]:
+    """通过共享的 arequest 会话发送请求，返回值与 _request_aiohttp 一致（不支持 max_bytes）"""
+    global _arequest_session
+    if _arequest_session is None:
+        _arequest_session = _http.Session()
+    
+    response = await _arequest_session.request(method, url, json=data, headers=headers, params=params)
+    if not read_body:
+        return response.status_code, None, ""
+    
+    try:
+        response_data = response.json()
+    except ValueError:
+        response_data = response.text
+    
+    response_text = ""
+    if response.status_code >= 400:
+        response_text = response_data if isinstance(response_data, str) else response.text
+    return response.status_code, response_data, response_text
+
 
 class NetworkOperationEnum(str, Enum):
     GET = "GET"
@@ -24,25 +203,25 @@ class NetworkRequestTool(ToolBase):
         'GET': OperationConfig(
             description='获取数据',
             required_params=['url'],
-            optional_params=['headers', 'params'],
+            optional_params=['headers', 'params', 'read_body', 'max_bytes'],
             is_dangerous=False
         ),
         'POST': OperationConfig(
             description='提交数据',
             required_params=['url'],
-            optional_params=['data', 'headers', 'params'],
+            optional_params=['data', 'headers', 'params', 'read_body', 'max_bytes'],
             is_dangerous=False
         ),
         'PUT': OperationConfig(
             description='更新数据',
             required_params=['url'],
-            optional_params=['data', 'headers', 'params'],
+            optional_params=['data', 'headers', 'params', 'read_body', 'max_bytes'],
             is_dangerous=False
         ),
         'DELETE': OperationConfig(
             description='删除数据',
             required_params=['url'],
-            optional_params=['headers', 'params'],
+            optional_params=['headers', 'params', 'read_body', 'max_bytes'],
             is_dangerous=False
         )
     }
@@ -54,55 +233,45 @@ class NetworkRequestTool(ToolBase):
         data = kwargs.get('data')
         headers = kwargs.get('headers')
         params = kwargs.get('params')
+        read_body = kwargs.get('read_body', True)
+        max_bytes = kwargs.get('max_bytes') or 0
         
         try:
-            import aiohttp
+            async with _get_semaphore():
+                if _http is not None:
+                    status, response_data, response_text = await _request_arequest(operation, url, data, headers, params, read_body, max_bytes)
+                else:
+                    status, response_data, response_text = await _request_aiohttp(operation, url, data, headers, params, read_body, max_bytes)
             
-            async with aiohttp.ClientSession() as session:
-                async with session.request(
-                    method=operation,
-                    url=url,
-                    json=data,
-                    headers=headers,
-                    params=params
-                ) as response:
-                    response_text = await response.text()
-                    try:
-                        response_data = await response.json()
-                    except:
-                        response_data = response_text
-                    
-                    status_success = response.status < 400
-                    
-                    if status_success:
-                        message_parts = [
-                            f"🌐 网络请求成功",
-                            f"📡 方法: {operation}",
-                            f"🔗 URL: {url}",
-                            f"✅ 状态码: {response.status}"
-                        ]
-                        
-                        if params:
-                            message_parts.append(f"📝 URL参数: {params}")
-                        
-                        if isinstance(response_data, dict):
-                            data_preview = str(response_data)[:200] + ("..." if len(str(response_data)) > 200 else "")
-                            message_parts.append(f"\n📄 响应数据预览:")
-                            message_parts.append(data_preview)
-                        elif isinstance(response_data, str):
-                            data_preview = response_data[:200] + ("..." if len(response_data) > 200 else "")
-                            message_parts.append(f"\n📄 响应文本预览:")
-                            message_parts.append(data_preview)
-                        
-                        return (ToolResult.success(response_data)
-                            .with_extra("status_code", response.status)
-                            .with_message("\n".join(message_parts))
-                            .build())
-                    else:
-                        return (ToolResult.error(f"HTTP {response.status}: {response_text[:200]}")
-                            .with_extra("status_code", response.status)
-                            .with_message(f"❌ 网络请求失败\n📡 方法: {operation}\n🔗 URL: {url}\n❌ 状态码: {response.status}\n📄 错误信息: {response_text[:200]}{'...' if len(response_text) > 200 else ''}")
-                            .build())
+            if status < 400:
+                message_parts = [
+                    f"🌐 网络请求成功",
+                    f"📡 方法: {operation}",
+                    f"🔗 URL: {url}",
+                    f"✅ 状态码: {status}"
+                ]
+                
+                if params:
+                    message_parts.append(f"📝 URL参数: {params}")
+                
+                if isinstance(response_data, dict):
+                    data_preview = str(response_data)[:200] + ("..." if len(str(response_data)) > 200 else "")
+                    message_parts.append(f"\n📄 响应数据预览:")
+                    message_parts.append(data_preview)
+                elif isinstance(response_data, str):
+                    data_preview = response_data[:200] + ("..." if len(response_data) > 200 else "")
+                    message_parts.append(f"\n📄 响应文本预览:")
+                    message_parts.append(data_preview)
+                
+                return (ToolResult.success(response_data)
+                    .with_extra("status_code", status)
+                    .with_message("\n".join(message_parts))
+                    .build())
+            else:
+                return (ToolResult.error(f"HTTP {status}: {response_text[:200]}")
+                    .with_extra("status_code", status)
+                    .with_message(f"❌ 网络请求失败\n📡 方法: {operation}\n🔗 URL: {url}\n❌ 状态码: {status}\n📄 错误信息: {response_text[:200]}{'...' if len(response_text) > 200 else ''}")
+                    .build())
         
         except ImportError:
             return ToolResult.error("未安装aiohttp库，请运行: pip install aiohttp").build()
@@ -120,7 +289,9 @@ def register_network_request_tools(mcp):
         url: str,
         data: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
-        params: Optional[Dict[str, Any]] = None
+        params: Optional[Dict[str, Any]] = None,
+        read_body: bool = True,
+        max_bytes: int = 0
     ) -> Dict[str, Any]:
         """网络请求工具
         
@@ -140,6 +311,8 @@ def register_network_request_tools(mcp):
         可选参数:
             headers: 请求头（字典格式）
             params: URL参数（字典格式）
+            read_body: 是否读取响应体（默认True，为False时只返回状态码）
+            max_bytes: 最多读取的响应体字节数（默认0，表示不限制）
         
         Returns:
             执行结果字典
@@ -149,7 +322,9 @@ def register_network_request_tools(mcp):
             url=url,
             data=data,
             headers=headers,
-            params=params
+            params=params,
+            read_body=read_body,
+            max_bytes=max_bytes
         )
     
     return network_request
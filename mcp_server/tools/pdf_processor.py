@@ -1,19 +1,106 @@
 import os
+import asyncio
+import itertools
 import subprocess
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Optional, Tuple, List, Iterator
 from mcp.server.fastmcp import Context
 from .tool_base import ToolBase, ToolResult, OperationConfig, register_tool
 from .file_operations import FileOperationsTool
 
 try:
+    import pypdf
     from pypdf import PdfReader, PdfWriter
     import io
     PDF_AVAILABLE = True
 except ImportError:
     PDF_AVAILABLE = False
 
+# 输出 PDF 的写缓冲大小：pypdf 写出时会产生大量小块 write，用大缓冲合并成较少的系统调用
+WRITE_BUFFER_SIZE = 1 << 20
+
+_PdfReader = PdfReader if PDF_AVAILABLE else None
+
+# pypdf 6.9 起已自带对象流整表缓存，只在更早的版本上替换读取器
+if PDF_AVAILABLE and tuple(int(v) for v in pypdf.__version__.split('.')[:2]) < (6, 9):
+    try:
+        from pypdf.generic import IndirectObject, NumberObject, read_object
+        from pypdf._utils import read_non_whitespace
+        
+        class _ObjStmCachedReader(PdfReader):
+            """缓存对象流（ObjStm）偏移表的 PdfReader
+            
+            pypdf 每次从对象流取对象都会从头扫描一遍流头部的 (对象号, 偏移) 表，
+            对于把所有对象都打包进同一个 ObjStm 的 PDF，逐页复制会退化为 O(N²)。
+            这里在首次访问某个对象流时解析整张表，之后按字典直接定位。
+            """
+            
+            def __init__(self, *args, **kwargs):
+                self._objstm_cache = {}
+                super().__init__(*args, **kwargs)
+            
+            def _get_object_from_stream(self, indirect_reference):
+                stmnum, _ = self.xref_objStm[indirect_reference.idnum]
+                entry = self._objstm_cache.get(stmnum)
+                try:
+                    if entry is None:
+                        obj_stm = IndirectObject(stmnum, 0, self).get_object()
+                        stream_data = io.BytesIO(obj_stm.get_data())
+                        offsets = {}
+                        for _ in range(obj_stm["/N"]):
+                            read_non_whitespace(stream_data)
+                            stream_data.seek(-1, 1)
+                            objnum = NumberObject.read_from_stream(stream_data)
+                            read_non_whitespace(stream_data)
+                            stream_data.seek(-1, 1)
+                            offset = NumberObject.read_from_stream(stream_data)
+                            offsets[int(objnum)] = int(offset)
+                        entry = (stream_data, int(obj_stm["/First"]), offsets)
+                        self._objstm_cache[stmnum] = entry
+                    
+                    stream_data, first, offsets = entry
+                    offset = offsets.get(indirect_reference.idnum)
+                    if offset is not None:
+                        stream_data.seek(first + offset, 0)
+                        read_non_whitespace(stream_data)
+                        stream_data.seek(-1, 1)
+                        return read_object(stream_data, self)
+                except Exception:
+                    pass
+                # 缓存未命中或解析异常时交给 pypdf 原有逻辑处理（含 strict 模式的报错）
+                return super()._get_object_from_stream(indirect_reference)
+        
+        _PdfReader = _ObjStmCachedReader
+    except ImportError:
+        pass
+
+
+def _parse_pages(spec: str, max_pages: int) -> Iterator[int]:
+    """把 "1-3,5" 形式的页面范围解析为从 0 开始、升序且不重复的页码迭代器
+    
+    超出 [1, max_pages] 的部分会被忽略；重叠的区间先合并，
+    因此即使是 "1-50000" 这样的大范围也不会展开成列表。
+    """
+    spans = []
+    for part in spec.split(','):
+        if '-' in part:
+            start, end = map(int, part.split('-'))
+        else:
+            start = end = int(part)
+        start, end = max(start, 1) - 1, min(end, max_pages)
+        if start < end:
+            spans.append((start, end))
+    
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    
+    return itertools.chain.from_iterable(range(start, end) for start, end in merged)
+
 
 class PDFOperationEnum(str, Enum):
     MERGE = "merge"
@@ -106,18 +193,6 @@ class PDFProcessorTool(ToolBase):
         
         return None
     
-    def _parse_page_range(self, pages: str, max_pages: int) -> List[int]:
-        page_numbers = []
-        for part in pages.split(','):
-            if '-' in part:
-                start, end = map(int, part.split('-'))
-                page_numbers.extend(range(start - 1, min(end, max_pages)))
-            else:
-                page_num = int(part) - 1
-                if 0 <= page_num < max_pages:
-                    page_numbers.append(page_num)
-        return sorted(set(page_numbers))
-    
     async def execute(self, ctx: Optional[Context] = None, **kwargs) -> Dict[str, Any]:
         operation = kwargs.get('operation')
         input_path = kwargs.get('input_path')
@@ -131,16 +206,17 @@ class PDFProcessorTool(ToolBase):
         if validation_error:
             return ToolResult.error(validation_error).build()
         
+        # 各分支都是阻塞的 CPU/磁盘操作，统一放到线程中执行，避免阻塞其他工具调用
         if operation == 'merge':
-            return self._merge_pdfs(input_paths, output_processed)
+            return await asyncio.to_thread(self._merge_pdfs, input_paths, output_processed)
         elif operation == 'insert':
-            return self._insert_pages(input_paths, output_processed, insert_position)
+            return await asyncio.to_thread(self._insert_pages, input_paths, output_processed, insert_position)
         elif operation == 'print':
-            return self._print_pdf(input_paths)
+            return await asyncio.to_thread(self._print_pdf, input_paths)
         elif operation == 'extract':
-            return self._extract_pages(input_paths[0], output_processed, pages)
+            return await asyncio.to_thread(self._extract_pages, input_paths[0], output_processed, pages)
         elif operation == 'split':
-            return self._split_pdf(input_paths[0], output_processed, pages)
+            return await asyncio.to_thread(self._split_pdf, input_paths[0], output_processed, pages)
         else:
             return ToolResult.error(f"不支持的操作: {operation}").build()
     
@@ -150,18 +226,13 @@ class PDFProcessorTool(ToolBase):
         
         try:
             pdf_writer = PdfWriter()
-            total_pages = 0
             
+            # append 整体复制每个文件的页面树，比逐页 add_page 少了大量间接对象解析
             for pdf_path in input_paths:
-                with open(pdf_path, 'rb') as f:
-                    pdf_reader = PdfReader(f)
-                    total_pages += len(pdf_reader.pages)
-                    
-                    for page_num in range(len(pdf_reader.pages)):
-                        page = pdf_reader.pages[page_num]
-                        pdf_writer.add_page(page)
+                pdf_writer.append(_PdfReader(pdf_path))
+            total_pages = len(pdf_writer.pages)
             
-            with open(output_path, 'wb') as f:
+            with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
                 pdf_writer.write(f)
             
             return (ToolResult.success(f"PDF 合并成功，共 {len(input_paths)} 个文件")
@@ -183,33 +254,23 @@ class PDFProcessorTool(ToolBase):
         
         try:
             pdf_writer = PdfWriter()
-            inserted_pages = 0
             
+            # 目标文件只解析一次，按插入点把页面分成前后两段
             with open(input_paths[0], 'rb') as f:
-                target_reader = PdfReader(f)
-                target_pages = len(target_reader.pages)
+                target_reader = _PdfReader(f)
+                pivot = min(insert_position - 1, len(target_reader.pages))
                 
-                for page_num in range(min(insert_position - 1, target_pages)):
-                    page = target_reader.pages[page_num]
+                for page in target_reader.pages[:pivot]:
                     pdf_writer.add_page(page)
-            
-            for pdf_path in input_paths[1:]:
-                with open(pdf_path, 'rb') as f:
-                    insert_reader = PdfReader(f)
-                    inserted_pages += len(insert_reader.pages)
-                    
-                    for page_num in range(len(insert_reader.pages)):
-                        page = insert_reader.pages[page_num]
-                        pdf_writer.add_page(page)
-            
-            with open(input_paths[0], 'rb') as f:
-                target_reader = PdfReader(f)
                 
-                for page_num in range(insert_position - 1, target_pages):
-                    page = target_reader.pages[page_num]
+                for pdf_path in input_paths[1:]:
+                    pdf_writer.append(_PdfReader(pdf_path))
+                inserted_pages = len(pdf_writer.pages) - pivot
+                
+                for page in target_reader.pages[pivot:]:
                     pdf_writer.add_page(page)
             
-            with open(output_path, 'wb') as f:
+            with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
                 pdf_writer.write(f)
             
             return (ToolResult.success(f"PDF 插入成功，插入位置: {insert_position}")
@@ -225,9 +286,14 @@ class PDFProcessorTool(ToolBase):
     def _print_pdf(self, input_paths: List[str]) -> Dict[str, Any]:
         try:
             if os.name == 'nt':
-                subprocess.run(['print', input_paths[0]], check=True, shell=True)
+                # 直接交给文件关联的打印处理程序（ShellExecute "print"），不经过 cmd.exe
+                os.startfile(input_paths[0], 'print')
             else:
-                subprocess.run(['lp', input_paths[0]], check=True)
+                pid = os.posix_spawnp('lp', ['lp', input_paths[0]], os.environ)
+                _, status = os.waitpid(pid, 0)
+                exit_code = os.waitstatus_to_exitcode(status)
+                if exit_code != 0:
+                    raise subprocess.CalledProcessError(exit_code, ['lp', input_paths[0]])
             
             return (ToolResult.success("PDF 打印成功")
                 .with_extra("input_path", input_paths[0])
@@ -245,22 +311,21 @@ class PDFProcessorTool(ToolBase):
         
         try:
             with open(input_path, 'rb') as f:
-                pdf_reader = PdfReader(f)
+                pdf_reader = _PdfReader(f)
                 total_pages = len(pdf_reader.pages)
-                page_numbers = self._parse_page_range(pages, total_pages)
                 
                 pdf_writer = PdfWriter()
-                for page_num in page_numbers:
-                    page = pdf_reader.pages[page_num]
-                    pdf_writer.add_page(page)
+                for page_num in _parse_pages(pages, total_pages):
+                    pdf_writer.add_page(pdf_reader.pages[page_num])
+                page_count = len(pdf_writer.pages)
                 
-                with open(output_path, 'wb') as out_f:
+                with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as out_f:
                     pdf_writer.write(out_f)
             
-            return (ToolResult.success(f"PDF 提取成功，提取页数: {len(page_numbers)}")
+            return (ToolResult.success(f"PDF 提取成功，提取页数: {page_count}")
                 .with_extra("input_path", input_path)
                 .with_extra("output_path", output_path)
-                .with_message(f"✅ PDF 提取成功\n📄 输入文件: {os.path.basename(input_path)}\n📄 输出文件: {os.path.basename(output_path)}\n📊 提取页数: {len(page_numbers)}\n📋 页面范围: {pages}")
+                .with_message(f"✅ PDF 提取成功\n📄 输入文件: {os.path.basename(input_path)}\n📄 输出文件: {os.path.basename(output_path)}\n📊 提取页数: {page_count}\n📋 页面范围: {pages}")
                 .build())
         except Exception as e:
             return ToolResult.error(f"提取失败: {str(e)}").build()
@@ -274,22 +339,21 @@ class PDFProcessorTool(ToolBase):
         
         try:
             with open(input_path, 'rb') as f:
-                pdf_reader = PdfReader(f)
+                pdf_reader = _PdfReader(f)
                 total_pages = len(pdf_reader.pages)
-                page_numbers = self._parse_page_range(pages, total_pages)
                 
                 pdf_writer = PdfWriter()
-                for page_num in page_numbers:
-                    page = pdf_reader.pages[page_num]
-                    pdf_writer.add_page(page)
+                for page_num in _parse_pages(pages, total_pages):
+                    pdf_writer.add_page(pdf_reader.pages[page_num])
+                page_count = len(pdf_writer.pages)
                 
-                with open(output_path, 'wb') as out_f:
+                with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as out_f:
                     pdf_writer.write(out_f)
             
-            return (ToolResult.success(f"PDF 拆分成功，拆分页数: {len(page_numbers)}")
+            return (ToolResult.success(f"PDF 拆分成功，拆分页数: {page_count}")
                 .with_extra("input_path", input_path)
                 .with_extra("output_path", output_path)
-                .with_message(f"✅ PDF 拆分成功\n📄 输入文件: {os.path.basename(input_path)}\n📄 输出文件: {os.path.basename(output_path)}\n📊 拆分页数: {len(page_numbers)}\n📋 页面范围: {pages}")
+                .with_message(f"✅ PDF 拆分成功\n📄 输入文件: {os.path.basename(input_path)}\n📄 输出文件: {os.path.basename(output_path)}\n📊 拆分页数: {page_count}\n📋 页面范围: {pages}")
                 .build())
         except Exception as e:
             return ToolResult.error(f"拆分失败: {str(e)}").build()
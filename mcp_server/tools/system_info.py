@@ -1,10 +1,157 @@
+import time
+import heapq
+import asyncio
 import platform
 import psutil
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, Callable, List
 from mcp.server.fastmcp import Context
 from .tool_base import ToolBase, ToolResult, OperationConfig, register_tool
 
 
+# 各类信息的缓存有效期（秒），界面轮询时避免每次都重新采样
+CACHE_TTL = 2.0
+
+_cache: Dict[str, Tuple[float, Any]] = {}
+
+
+async def _cached(key: str, ttl: float, collector: Callable[[], Any]) -> Any:
+    """返回 key 对应的缓存结果，过期时在线程中调用 collector 重新采集"""
+    entry = _cache.get(key)
+    now = time.monotonic()
+    if entry is not None and now - entry[0] < ttl:
+        return entry[1]
+    
+    value = await asyncio.to_thread(collector)
+    _cache[key] = (time.monotonic(), value)
+    return value
+
+
+def _collect_os() -> Dict[str, Any]:
+    return {
+        "system": platform.system(),
+        "version": platform.version(),
+        "machine": platform.machine(),
+        "processor": platform.processor()
+    }
+
+
+def _collect_cpu() -> Dict[str, Any]:
+    # interval=None 不阻塞，返回与上一次调用之间的平均使用率（注册时已预热一次）
+    freq = psutil.cpu_freq()
+    return {
+        "percent": psutil.cpu_percent(interval=None),
+        "count": psutil.cpu_count(),
+        "freq": freq._asdict() if freq else {}
+    }
+
+
+def _collect_memory() -> Dict[str, Any]:
+    mem = psutil.virtual_memory()
+    return {
+        "total": mem.total,
+        "available": mem.available,
+        "percent": mem.percent,
+        "used": mem.used
+    }
+
+
+def _collect_disk() -> Dict[str, Any]:
+    disk = psutil.disk_usage('/')
+    return {
+        "total": disk.total,
+        "used": disk.used,
+        "free": disk.free,
+        "percent": disk.percent
+    }
+
+
+def _collect_network() -> Dict[str, Any]:
+    return {
+        "connections": len(psutil.net_connections()),
+        "interfaces": list(psutil.net_if_addrs().keys())
+    }
+
+
+def _collect_process() -> Dict[str, Any]:
+    return {
+        "count": len(psutil.pids()),
+        # nlargest 只维护 5 个元素的堆，不必对全部进程排序
+        "top_cpu": [p.info for p in heapq.nlargest(5, psutil.process_iter(['pid', 'name', 'cpu_percent']),
+                                                   key=lambda x: x.info['cpu_percent'] or 0.0)]
+    }
+
+
+def _format_os(os_info: Dict[str, Any]) -> List[str]:
+    return [
+        "💻 操作系统信息:",
+        f"  系统: {os_info['system']}",
+        f"  版本: {os_info['version']}",
+        f"  架构: {os_info['machine']}",
+        f"  处理器: {os_info['processor']}"
+    ]
+
+
+def _format_cpu(cpu_info: Dict[str, Any]) -> List[str]:
+    lines = [
+        "\n⚡ CPU信息:",
+        f"  使用率: {cpu_info['percent']}%",
+        f"  核心数: {cpu_info['count']}"
+    ]
+    if cpu_info['freq']:
+        lines.append(f"  频率: {cpu_info['freq'].get('current', 0):.1f}MHz")
+    return lines
+
+
+def _format_memory(memory_info: Dict[str, Any]) -> List[str]:
+    return [
+        "\n🗃️ 内存信息:",
+        f"  总内存: {memory_info['total'] / (1024**3):.2f}GB",
+        f"  已使用: {memory_info['used'] / (1024**3):.2f}GB ({memory_info['percent']}%)",
+        f"  可用: {memory_info['available'] / (1024**3):.2f}GB"
+    ]
+
+
+def _format_disk(disk_info: Dict[str, Any]) -> List[str]:
+    return [
+        "\n💽 磁盘信息:",
+        f"  总空间: {disk_info['total'] / (1024**3):.2f}GB",
+        f"  已使用: {disk_info['used'] / (1024**3):.2f}GB ({disk_info['percent']}%)",
+        f"  可用: {disk_info['free'] / (1024**3):.2f}GB"
+    ]
+
+
+def _format_network(network_info: Dict[str, Any]) -> List[str]:
+    return [
+        "\n🌐 网络信息:",
+        f"  连接数: {network_info['connections']}",
+        f"  网络接口: {', '.join(network_info['interfaces'])}"
+    ]
+
+
+def _format_process(process_info: Dict[str, Any]) -> List[str]:
+    lines = [
+        "\n📊 进程信息:",
+        f"  进程总数: {process_info['count']}"
+    ]
+    if process_info['top_cpu']:
+        lines.append("  CPU使用率最高的进程:")
+        for p in process_info['top_cpu']:
+            if (p.get('cpu_percent') or 0) > 0:
+                lines.append(f"    - {p['name']} (PID: {p['pid']}): {p['cpu_percent']:.1f}%")
+    return lines
+
+
+# 信息类型 -> (采集函数, 格式化函数)，按此顺序输出 "all" 的各部分
+_COLLECTORS: Dict[str, Tuple[Callable[[], Dict[str, Any]], Callable[[Dict[str, Any]], List[str]]]] = {
+    "os": (_collect_os, _format_os),
+    "cpu": (_collect_cpu, _format_cpu),
+    "memory": (_collect_memory, _format_memory),
+    "disk": (_collect_disk, _format_disk),
+    "network": (_collect_network, _format_network),
+    "process": (_collect_process, _format_process)
+}
+
+
 @register_tool("system_info")
 class SystemInfoTool(ToolBase):
     """系统信息工具
@@ -66,85 +213,12 @@ class SystemInfoTool(ToolBase):
         result = {}
         formatted_message = []
         
-        if info_type in ["all", "os"]:
-            os_info = {
-                "system": platform.system(),
-                "version": platform.version(),
-                "machine": platform.machine(),
-                "processor": platform.processor()
-            }
-            result["os"] = os_info
-            formatted_message.append("💻 操作系统信息:")
-            formatted_message.append(f"  系统: {os_info['system']}")
-            formatted_message.append(f"  版本: {os_info['version']}")
-            formatted_message.append(f"  架构: {os_info['machine']}")
-            formatted_message.append(f"  处理器: {os_info['processor']}")
-        
-        if info_type in ["all", "cpu"]:
-            cpu_info = {
-                "percent": psutil.cpu_percent(interval=1),
-                "count": psutil.cpu_count(),
-                "freq": psutil.cpu_freq()._asdict() if psutil.cpu_freq() else {}
-            }
-            result["cpu"] = cpu_info
-            formatted_message.append("\n⚡ CPU信息:")
-            formatted_message.append(f"  使用率: {cpu_info['percent']}%")
-            formatted_message.append(f"  核心数: {cpu_info['count']}")
-            if cpu_info['freq']:
-                formatted_message.append(f"  频率: {cpu_info['freq'].get('current', 0):.1f}MHz")
-        
-        if info_type in ["all", "memory"]:
-            mem = psutil.virtual_memory()
-            memory_info = {
-                "total": mem.total,
-                "available": mem.available,
-                "percent": mem.percent,
-                "used": mem.used
-            }
-            result["memory"] = memory_info
-            formatted_message.append("\n🗃️ 内存信息:")
-            formatted_message.append(f"  总内存: {mem.total / (1024**3):.2f}GB")
-            formatted_message.append(f"  已使用: {mem.used / (1024**3):.2f}GB ({mem.percent}%)")
-            formatted_message.append(f"  可用: {mem.available / (1024**3):.2f}GB")
-        
-        if info_type in ["all", "disk"]:
-            disk = psutil.disk_usage('/')
-            disk_info = {
-                "total": disk.total,
-                "used": disk.used,
-                "free": disk.free,
-                "percent": disk.percent
-            }
-            result["disk"] = disk_info
-            formatted_message.append("\n💽 磁盘信息:")
-            formatted_message.append(f"  总空间: {disk.total / (1024**3):.2f}GB")
-            formatted_message.append(f"  已使用: {disk.used / (1024**3):.2f}GB ({disk.percent}%)")
-            formatted_message.append(f"  可用: {disk.free / (1024**3):.2f}GB")
-        
-        if info_type in ["all", "network"]:
-            network_info = {
-                "connections": len(psutil.net_connections()),
-                "interfaces": list(psutil.net_if_addrs().keys())
-            }
-            result["network"] = network_info
-            formatted_message.append("\n🌐 网络信息:")
-            formatted_message.append(f"  连接数: {network_info['connections']}")
-            formatted_message.append(f"  网络接口: {', '.join(network_info['interfaces'])}")
-        
-        if info_type in ["all", "process"]:
-            process_info = {
-                "count": len(psutil.pids()),
-                "top_cpu": [p.info for p in sorted(psutil.process_iter(['pid', 'name', 'cpu_percent']), 
-                                                      key=lambda x: x.info['cpu_percent'], reverse=True)[:5]]
-            }
-            result["process"] = process_info
-            formatted_message.append("\n📊 进程信息:")
-            formatted_message.append(f"  进程总数: {process_info['count']}")
-            if process_info['top_cpu']:
-                formatted_message.append("  CPU使用率最高的进程:")
-                for p in process_info['top_cpu']:
-                    if p.get('cpu_percent', 0) > 0:
-                        formatted_message.append(f"    - {p['name']} (PID: {p['pid']}): {p['cpu_percent']:.1f}%")
+        types = _COLLECTORS.keys() if info_type == "all" else (info_type,)
+        for key in types:
+            collector, formatter = _COLLECTORS[key]
+            info = await _cached(key, CACHE_TTL, collector)
+            result[key] = info
+            formatted_message.extend(formatter(info))
         
         return (ToolResult.success(result)
             .with_message("\n".join(formatted_message))
@@ -155,6 +229,9 @@ def register_system_info_tools(mcp):
     """注册系统信息工具到MCP服务器"""
     tool = SystemInfoTool()
     
+    # 预热 CPU 使用率采样，之后 cpu_percent(interval=None) 返回的是两次调用之间的平均值
+    psutil.cpu_percent(interval=None)
+    
     @mcp.tool()
     async def system_info(info_type: str = "all") -> Dict[str, Any]:
         """获取系统信息工具
@@ -1,8 +1,13 @@
 # 文本处理工具
 
 import asyncio
+import io
 import os
-from typing import Dict, Any, Optional, Tuple
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple, Iterable, Callable, TextIO
 from enum import Enum
 from pathlib import Path
 from mcp.server.fastmcp import Context
@@ -11,6 +16,135 @@ from .tool_base import (
 )
 
 
+# pyttsx3.init() 对同一驱动总是返回同一个引擎，引擎不能在多个线程中同时 runAndWait，
+# 因此所有合成都提交到同一个专用线程串行执行，引擎由该线程创建后复用
+_tts_executor: Optional[ThreadPoolExecutor] = None
+_tts_executor_lock = threading.Lock()
+_tts_engine = None
+_tts_default_voice = None
+
+
+def _init_tts_thread() -> None:
+    """语音合成线程初始化：Windows 上 SAPI5 驱动依赖 COM，comtypes 只在导入它的线程中初始化 COM"""
+    if sys.platform == 'win32':
+        import comtypes
+        comtypes.CoInitialize()
+
+
+def _get_tts_executor() -> ThreadPoolExecutor:
+    """获取（必要时创建）语音合成专用的单线程执行器"""
+    global _tts_executor
+    with _tts_executor_lock:
+        if _tts_executor is None:
+            _tts_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='tts', initializer=_init_tts_thread
+            )
+        return _tts_executor
+
+
+def _synthesize(text: str, output_file: str, rate: int, volume: float, voice: Optional[str]) -> None:
+    """在语音合成线程中用 pyttsx3 合成语音并保存到文件（阻塞调用）"""
+    global _tts_engine, _tts_default_voice
+    import pyttsx3
+    
+    engine = _tts_engine
+    if engine is None:
+        engine = _tts_engine = pyttsx3.init()
+        _tts_default_voice = engine.getProperty('voice')
+    
+    engine.setProperty('rate', rate)
+    engine.setProperty('volume', volume)
+    
+    # 复用的引擎会保留上一次的声音设置，未指定时恢复默认声音
+    voice_id = _tts_default_voice
+    if voice:
+        for v in engine.getProperty('voices'):
+            if voice in v.id or voice in v.name:
+                voice_id = v.id
+                break
+    engine.setProperty('voice', voice_id)
+    
+    engine.save_to_file(text, output_file)
+    engine.runAndWait()
+
+
+# 流式读取输入文件时每次读取的字符数
+_READ_CHUNK_SIZE = 64 * 1024
+
+# 超过该长度的文本块用 numpy 统计空白字符，短文本编码的开销反而更大
+_NUMPY_MIN_CHARS = 1 << 16
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# str.splitlines() 识别的全部换行符（\r\n 作为一个整体）
+_LINE_BREAKS = '\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029'
+# 除 \n 以外的换行符；文本块中不含这些字符时，换行数就是 \n 的个数
+_OTHER_LINE_BREAK_RE = re.compile('[\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+def _read_all(f: TextIO) -> str:
+    return f.read()
+
+
+def _blank_counts(chunk: str) -> Tuple[int, int]:
+    """返回 (空格、换行、制表符的总数, 换行符数)"""
+    if np is not None and len(chunk) >= _NUMPY_MIN_CHARS:
+        # UTF-8 中多字节字符的各字节都 >= 0x80，按字节比较不会误判
+        buf = np.frombuffer(chunk.encode('utf-8', 'surrogatepass'), dtype=np.uint8)
+        newlines = int(np.count_nonzero(buf == 0x0A))
+        return newlines + int(np.count_nonzero(buf == 0x20)) + int(np.count_nonzero(buf == 0x09)), newlines
+    
+    newlines = chunk.count('\n')
+    return newlines + chunk.count(' ') + chunk.count('\t'), newlines
+
+
+def _count_chunks(chunks: Iterable[str]) -> Dict[str, int]:
+    """逐块统计字符数、单词数和行数，结果与对整段文本统计一致"""
+    characters = characters_no_spaces = words = line_breaks = 0
+    in_word = False
+    line_open = False
+    ends_with_cr = False
+    
+    for chunk in chunks:
+        if not chunk:
+            continue
+        characters += len(chunk)
+        blanks, newlines = _blank_counts(chunk)
+        characters_no_spaces += len(chunk) - blanks
+        
+        words += len(chunk.split())
+        if in_word and not chunk[0].isspace():
+            # 单词被块边界截断，前后两半只算一个
+            words -= 1
+        in_word = not chunk[-1].isspace()
+        
+        # 行数与 len(text.splitlines()) 一致
+        line_open = chunk[-1] not in _LINE_BREAKS
+        if _OTHER_LINE_BREAK_RE.search(chunk) is None:
+            line_breaks += newlines
+        else:
+            line_breaks += len(chunk.splitlines()) - (1 if line_open else 0)
+        if ends_with_cr and chunk[0] == '\n':
+            # \r\n 被块边界拆开，只算一个换行
+            line_breaks -= 1
+        ends_with_cr = chunk[-1] == '\r'
+    
+    return {
+        "characters": characters,
+        "characters_no_spaces": characters_no_spaces,
+        "words": words,
+        "lines": line_breaks + (1 if line_open else 0)
+    }
+
+
+def _count_file(f: TextIO) -> Dict[str, int]:
+    """按块流式统计文件内容，不把整个文件读入内存"""
+    return _count_chunks(iter(lambda: f.read(_READ_CHUNK_SIZE), ""))
+
+
 class TextOperationEnum(str, Enum):
     TO_AUDIO = "to_audio"
     SUMMARIZE = "summarize"
@@ -90,11 +224,17 @@ class TextProcessingTool(ToolBase):
         volume = kwargs.get('volume', 1.0)
         
         if input_file:
-            text, error = self._read_input_file(input_file)
+            # 文件读取和 .docx 解析都是阻塞操作，放到线程中执行；
+            # count 只需要统计结果，按块流式读取即可
+            consume = _count_file if operation == "count" else _read_all
+            content, error = await asyncio.to_thread(self._read_input_file, input_file, consume)
             if error:
                 return error
-            if text and kwargs.get('text'):
+            if content and kwargs.get('text'):
                 self.logger.warning("同时提供了text和input_file参数，将优先使用input_file的内容")
+            if operation == "count":
+                return self._count_result(content)
+            text = content
         
         if operation == "to_audio":
             return await self._to_audio(text, output_path, input_file, rate, volume, voice)
@@ -107,11 +247,17 @@ class TextProcessingTool(ToolBase):
         else:
             return ToolResult.error(f"不支持的操作: {operation}").build()
     
-    def _read_input_file(self, input_file: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    def _read_input_file(
+        self, input_file: str, consume: Callable[[TextIO], Any] = _read_all
+    ) -> Tuple[Any, Optional[Dict[str, Any]]]:
         """读取输入文件
         
+        Args:
+            input_file: 输入文件路径
+            consume: 处理已打开文本流的函数，默认读出全部文本
+        
         Returns:
-            (text, error_result) - 成功时error_result为None，失败时text为None
+            (content, error_result) - 成功时error_result为None，失败时content为None
         """
         # 使用通用函数处理路径（支持从列表字符串中提取第一个路径）
         try:
@@ -134,8 +280,8 @@ class TextProcessingTool(ToolBase):
                 try:
                     from docx import Document
                     doc = Document(input_file)
-                    file_text = '\n'.join([p.text for p in doc.paragraphs])
-                    return file_text, None
+                    file_text = '\n'.join(p.text for p in doc.paragraphs if p.text)
+                    return consume(io.StringIO(file_text)), None
                 except ImportError:
                     return None, ToolResult.error(
                         "未安装python-docx库，请运行: pip install python-docx"
@@ -146,7 +292,7 @@ class TextProcessingTool(ToolBase):
                 ).build()
             else:
                 with open(input_file, 'r', encoding='utf-8') as f:
-                    return f.read(), None
+                    return consume(f), None
         except Exception as e:
             return None, ToolResult.error(f"读取输入文件失败: {str(e)}").build()
     
@@ -165,19 +311,10 @@ class TextProcessingTool(ToolBase):
         output_file = self._determine_output_path(output_path, input_file)
         
         try:
-            engine = pyttsx3.init()
-            engine.setProperty('rate', rate)
-            engine.setProperty('volume', volume)
-            
-            if voice:
-                voices = engine.getProperty('voices')
-                for v in voices:
-                    if voice in v.id or voice in v.name:
-                        engine.setProperty('voice', v.id)
-                        break
-            
-            engine.save_to_file(text, output_file)
-            engine.runAndWait()
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                _get_tts_executor(), _synthesize, text, output_file, rate, volume, voice
+            )
             
             return (ToolResult.success("音频生成成功（使用pyttsx3）")
                 .with_path(output_file)
@@ -250,12 +387,10 @@ class TextProcessingTool(ToolBase):
     
     def _count(self, text: str) -> Dict[str, Any]:
         """统计文本"""
-        result = {
-            "characters": len(text),
-            "characters_no_spaces": len(text.replace(" ", "").replace("\n", "").replace("\t", "")),
-            "words": len(text.split()),
-            "lines": len(text.splitlines())
-        }
+        return self._count_result(_count_chunks((text,)))
+    
+    def _count_result(self, result: Dict[str, int]) -> Dict[str, Any]:
+        """根据统计结果构建返回值"""
         return (ToolResult.success(result)
             .with_message(
                 f"📊 文本统计\n"
@@ -1,40 +1,76 @@
 # 错误处理工具
 
+import asyncio
+import functools
 import logging
+import random
+import time
 from typing import Dict, Any, Optional, Callable
 import traceback
 
+# 错误信息中最多保留的调用栈帧数（保留离出错位置最近的帧）
+TRACEBACK_LIMIT = 20
+
+# 重试间隔的上限（秒）
+MAX_RETRY_DELAY = 10.0
+
+
+def _backoff_delay(delay: float, attempt: int) -> float:
+    """计算第 attempt 次重试前的等待时间（指数退避 + 随机抖动，避免多个调用方同时重试）"""
+    return min(delay * (2 ** attempt) + random.random() * 0.1, MAX_RETRY_DELAY)
+
+
 class ErrorHandler:
     """错误处理器"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
-    def handle_error(self, error: Exception, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """处理错误"""
+    def handle_error(self, error: Exception, context: Optional[Dict[str, Any]] = None,
+                     include_traceback: Optional[bool] = None) -> Dict[str, Any]:
+        """处理错误
+        
+        Args:
+            error: 异常对象
+            context: 错误上下文（可选）
+            include_traceback: 是否在结果中附带调用栈（格式化调用栈需要遍历栈帧并读取源码行）；
+                默认只在 DEBUG 日志级别启用时附带
+        """
         error_info = {
             "error_type": type(error).__name__,
             "error_message": str(error),
-            "traceback": traceback.format_exc(),
             "context": context or {}
         }
         
-        self.logger.error(f"错误处理: {error_info}")
+        if include_traceback is None:
+            include_traceback = self.logger.isEnabledFor(logging.DEBUG)
+        if include_traceback:
+            error_info["traceback"] = "".join(traceback.format_exception(
+                type(error), error, error.__traceback__, limit=-TRACEBACK_LIMIT
+            ))
+        
+        # 惰性格式化：日志级别过滤掉该记录时不会把字典转换为字符串
+        self.logger.error("错误处理: %s", error_info)
         
         return error_info
     
     def retry_wrapper(self, max_retries: int = 3, delay: float = 1.0):
         """重试装饰器"""
         def decorator(func: Callable):
+            if max_retries <= 0:
+                # 没有可尝试的次数时直接返回原函数，调用时没有循环和异常处理的额外开销；
+                # max_retries == 1 仍需包装，失败时才会记录日志
+                return func
+            
+            @functools.wraps(func)
             async def wrapper(*args, **kwargs):
                 for attempt in range(max_retries):
                     try:
                         return await func(*args, **kwargs)
                     except Exception as e:
-                        self.logger.warning(f"执行失败 (尝试 {attempt + 1}/{max_retries}): {e}")
+                        self.logger.warning("执行失败 (尝试 %d/%d): %s", attempt + 1, max_retries, e)
                         if attempt < max_retries - 1:
-                            import asyncio
-                            await asyncio.sleep(delay)
+                            await asyncio.sleep(_backoff_delay(delay, attempt))
                             continue
                         raise
             return wrapper
@@ -43,23 +79,24 @@ class ErrorHandler:
     def sync_retry_wrapper(self, max_retries: int = 3, delay: float = 1.0):
         """同步重试装饰器"""
         def decorator(func: Callable):
+            if max_retries <= 0:
+                return func
+            
+            @functools.wraps(func)
             def wrapper(*args, **kwargs):
                 for attempt in range(max_retries):
                     try:
                         return func(*args, **kwargs)
                     except Exception as e:
-                        self.logger.warning(f"执行失败 (尝试 {attempt + 1}/{max_retries}): {e}")
+                        self.logger.warning("执行失败 (尝试 %d/%d): %s", attempt + 1, max_retries, e)
                         if attempt < max_retries - 1:
-                            import time
-                            time.sleep(delay)
+                            time.sleep(_backoff_delay(delay, attempt))
                             continue
                         raise
             return wrapper
         return decorator
 
-# 全局错误处理器实例
-error_handler = ErrorHandler()
-
+@functools.lru_cache(maxsize=1)
 def get_error_handler() -> ErrorHandler:
-    """获取错误处理器"""
-    return error_handler
+    """获取错误处理器（全局单例，首次调用时才创建）"""
+    return ErrorHandler()